@@ -0,0 +1,28 @@
+"""add_meeting_cached_transcript
+
+Revision ID: 3b6f0d5a8e21
+Revises: e2c86f4b1d93
+Create Date: 2026-10-16 15:52:40.113859
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b6f0d5a8e21'
+down_revision: Union[str, Sequence[str], None] = 'e2c86f4b1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('meetings', sa.Column('cached_transcript', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('meetings', 'cached_transcript')
@@ -0,0 +1,59 @@
+"""make_meeting_calendar_event_unique
+
+Revision ID: 5d9e2b7c0f18
+Revises: c41e7d08a2f5
+Create Date: 2026-10-16 13:47:05.221638
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9e2b7c0f18'
+down_revision: Union[str, Sequence[str], None] = 'c41e7d08a2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ON CONFLICT (user_id, calendar_event_id) needs a unique index; manual meetings keep NULL event ids
+    # Fold duplicated calendar events into their earliest row, moving any transcripts
+    # and summaries across so the foreign keys still hold, then drop the extras
+    for child in ('meeting_transcripts', 'meeting_summaries'):
+        op.execute(
+            f"""
+            UPDATE {child} c
+            SET meeting_id = keep.id
+            FROM meetings dup
+            JOIN meetings keep
+              ON keep.user_id = dup.user_id
+             AND keep.calendar_event_id = dup.calendar_event_id
+             AND keep.id = (
+                 SELECT min(m.id) FROM meetings m
+                 WHERE m.user_id = dup.user_id AND m.calendar_event_id = dup.calendar_event_id
+             )
+            WHERE c.meeting_id = dup.id
+              AND dup.id <> keep.id
+            """
+        )
+    op.execute(
+        """
+        DELETE FROM meetings a
+        USING meetings b
+        WHERE a.user_id = b.user_id
+          AND a.calendar_event_id = b.calendar_event_id
+          AND a.id > b.id
+        """
+    )
+    op.drop_index('ix_meeting_user_event', table_name='meetings', if_exists=True)
+    op.create_index('ix_meeting_user_event', 'meetings', ['user_id', 'calendar_event_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meeting_user_event', table_name='meetings')
+    op.create_index('ix_meeting_user_event', 'meetings', ['user_id', 'calendar_event_id'], unique=False)
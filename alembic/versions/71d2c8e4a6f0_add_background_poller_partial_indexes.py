@@ -0,0 +1,41 @@
+"""add_background_poller_partial_indexes
+
+Revision ID: 71d2c8e4a6f0
+Revises: 9c04a6e3f7b5
+Create Date: 2026-10-16 17:05:33.462917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71d2c8e4a6f0'
+down_revision: Union[str, Sequence[str], None] = '9c04a6e3f7b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_meetings_active_lastact', 'meetings', ['last_activity'], unique=False,
+        postgresql_where=sa.text("status = 'active'"), if_not_exists=True
+    )
+    op.create_index(
+        'ix_meetings_scheduled_start', 'meetings', ['start_time'], unique=False,
+        postgresql_where=sa.text("status = 'scheduled' AND is_manual = false"), if_not_exists=True
+    )
+    op.create_index(
+        'ix_tasks_due', 'tasks', ['due_date'], unique=False,
+        postgresql_where=sa.text("is_notified = false AND is_completed = false"), if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_due', table_name='tasks', if_exists=True)
+    op.drop_index('ix_meetings_scheduled_start', table_name='meetings', if_exists=True)
+    op.drop_index('ix_meetings_active_lastact', table_name='meetings', if_exists=True)
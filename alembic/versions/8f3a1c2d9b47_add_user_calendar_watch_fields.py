@@ -0,0 +1,34 @@
+"""add_user_calendar_watch_fields
+
+Revision ID: 8f3a1c2d9b47
+Revises: 2eb6f6f2d7bc
+Create Date: 2026-10-16 10:12:44.318902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a1c2d9b47'
+down_revision: Union[str, Sequence[str], None] = '2eb6f6f2d7bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('gcal_channel_id', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('gcal_resource_id', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('gcal_channel_expiration', sa.DateTime(), nullable=True))
+    op.add_column('users', sa.Column('gcal_sync_token', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'gcal_sync_token')
+    op.drop_column('users', 'gcal_channel_expiration')
+    op.drop_column('users', 'gcal_resource_id')
+    op.drop_column('users', 'gcal_channel_id')
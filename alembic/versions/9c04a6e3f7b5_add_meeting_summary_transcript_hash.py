@@ -0,0 +1,30 @@
+"""add_meeting_summary_transcript_hash
+
+Revision ID: 9c04a6e3f7b5
+Revises: 3b6f0d5a8e21
+Create Date: 2026-10-16 16:24:11.875402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c04a6e3f7b5'
+down_revision: Union[str, Sequence[str], None] = '3b6f0d5a8e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('meeting_summaries', sa.Column('transcript_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_meeting_summaries_transcript_hash'), 'meeting_summaries', ['transcript_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_meeting_summaries_transcript_hash'), table_name='meeting_summaries')
+    op.drop_column('meeting_summaries', 'transcript_hash')
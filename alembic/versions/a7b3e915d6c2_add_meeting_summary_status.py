@@ -0,0 +1,28 @@
+"""add_meeting_summary_status
+
+Revision ID: a7b3e915d6c2
+Revises: 5d9e2b7c0f18
+Create Date: 2026-10-16 14:31:52.640173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b3e915d6c2'
+down_revision: Union[str, Sequence[str], None] = '5d9e2b7c0f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('meetings', sa.Column('summary_status', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('meetings', 'summary_status')
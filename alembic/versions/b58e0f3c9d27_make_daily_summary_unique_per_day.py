@@ -0,0 +1,38 @@
+"""make_daily_summary_unique_per_day
+
+Revision ID: b58e0f3c9d27
+Revises: 71d2c8e4a6f0
+Create Date: 2026-10-16 18:12:40.587301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58e0f3c9d27'
+down_revision: Union[str, Sequence[str], None] = '71d2c8e4a6f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the latest row of any duplicated day before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM daily_summaries a
+        USING daily_summaries b
+        WHERE a.user_id = b.user_id
+          AND a.summary_date = b.summary_date
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint('uq_daily_summary_user_date', 'daily_summaries', ['user_id', 'summary_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_daily_summary_user_date', 'daily_summaries', type_='unique')
@@ -0,0 +1,33 @@
+"""add_meeting_lookup_indexes
+
+Revision ID: c41e7d08a2f5
+Revises: 8f3a1c2d9b47
+Create Date: 2026-10-16 11:02:17.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d08a2f5'
+down_revision: Union[str, Sequence[str], None] = '8f3a1c2d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Meeting tables are created by create_all at startup, which may already have added these
+    op.create_index('ix_meeting_user_event', 'meetings', ['user_id', 'calendar_event_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_meeting_user_status_start', 'meetings', ['user_id', 'status', 'start_time'], unique=False, if_not_exists=True)
+    op.create_index('ix_transcript_meeting_seq', 'meeting_transcripts', ['meeting_id', 'sequence_number'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transcript_meeting_seq', table_name='meeting_transcripts', if_exists=True)
+    op.drop_index('ix_meeting_user_status_start', table_name='meetings', if_exists=True)
+    op.drop_index('ix_meeting_user_event', table_name='meetings', if_exists=True)
@@ -0,0 +1,28 @@
+"""add_tasks_user_index
+
+Revision ID: d3a71f6b2e84
+Revises: b58e0f3c9d27
+Create Date: 2026-10-16 18:40:12.904516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a71f6b2e84'
+down_revision: Union[str, Sequence[str], None] = 'b58e0f3c9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user', 'tasks', ['user_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user', table_name='tasks')
@@ -0,0 +1,35 @@
+"""add_final_transcript_partial_index
+
+Revision ID: e2c86f4b1d93
+Revises: a7b3e915d6c2
+Create Date: 2026-10-16 15:18:26.507431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c86f4b1d93'
+down_revision: Union[str, Sequence[str], None] = 'a7b3e915d6c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transcript_meeting_final_seq',
+        'meeting_transcripts',
+        ['meeting_id', 'sequence_number'],
+        unique=False,
+        postgresql_where=sa.text('is_final = true'),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transcript_meeting_final_seq', table_name='meeting_transcripts', if_exists=True)
@@ -0,0 +1,38 @@
+"""add_stats_composite_indexes
+
+Revision ID: f6c29a4e8b13
+Revises: d3a71f6b2e84
+Create Date: 2026-10-16 19:02:47.316820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c29a4e8b13'
+down_revision: Union[str, Sequence[str], None] = 'd3a71f6b2e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, and keeps the tables writable while building
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_user_completed_due', 'tasks', ['user_id', 'is_completed', 'due_date'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_calendar_user_start', 'calendar_events', ['user_id', 'start_time'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_emailsummary_user_created', 'email_summaries', ['user_id', 'created_at'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        # The composite index starts with user_id, so it covers everything this one did
+        op.drop_index('ix_tasks_user', table_name='tasks', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_user', 'tasks', ['user_id'], unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_emailsummary_user_created', table_name='email_summaries', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_calendar_user_start', table_name='calendar_events', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_tasks_user_completed_due', table_name='tasks', if_exists=True, postgresql_concurrently=True)
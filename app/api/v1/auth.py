@@ -13,12 +13,16 @@ from ...services.auth import create_access_token, authenticate_user, bcrypt_cont
     create_user_from_google_info, get_user_by_google_sub, token_expired, decode_token, user_dependency
 from ...db.base import db_dependency
 from ...services.auth import oauth, hash_password, verify_password
+from ...services.calendar_service import GoogleCalendarService
+from ...utils.logger import get_logger
 from fastapi import Request
 from fastapi.responses import RedirectResponse
 import os
 import dotenv
 dotenv.load_dotenv()
 
+logger = get_logger(__name__)
+
 router = APIRouter(
     prefix='/auth',
     tags=['auth']
@@ -78,6 +82,12 @@ async def auth_google(request: Request, db: db_dependency):
         user.google_refresh_token = user_response.get("refresh_token")
         db.commit()
     
+    # Subscribe to calendar changes so meetings are picked up without polling
+    try:
+        GoogleCalendarService(user, db).ensure_watch()
+    except Exception as e:
+        logger.error(f"Error registering calendar watch for user {user.id}: {e}")
+    
     access_token = create_access_token(user.username, user.id, timedelta(days=7))
     refresh_token = create_refresh_token(user.username, user.id, timedelta(days=14))
     
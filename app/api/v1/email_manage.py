@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Query
+from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Query, Request, Response
 from typing import List, Optional
 from ...services.email_service import GmailService
 from ...services.auth import user_dependency
@@ -7,12 +7,19 @@ from ...schemas.email import (
     EmailSummaryResponse,
     ProcessEmailRequest,
     SendReplyRequest,
+    MarkReadRequest,
     EmailActionItemResponse
 )
 from ...db.models.email_manage import EmailSummary, EmailActionItem
 from ...core.ollama_config import check_ollama_status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from ...services.ai_processor import ai_processor
+from ...services.tts_service import tts_service
+from ...utils.logger import get_logger
+from pathlib import Path
+import asyncio
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix='/email', tags=['email'])
 
@@ -35,7 +42,7 @@ async def get_unread_email_list(
     try:
         gmail_service = GmailService(user, db)
         
-        result = gmail_service.list_unread_emails_paginated(
+        result = await gmail_service.list_unread_emails_paginated(
             max_results=limit, 
             page_token=page_token,
             category_filter=category
@@ -62,7 +69,7 @@ async def get_email_categories(
         gmail_service = GmailService(user, db)
         
         # Fetch a larger batch to get accurate counts
-        result = gmail_service.list_unread_emails_paginated(max_results=100)
+        result = await gmail_service.list_unread_emails_paginated(max_results=100)
         
         return {
             "category_counts": result['category_counts'],
@@ -105,7 +112,11 @@ async def process_single_email(
     gmail_service = GmailService(user, db)
     
     try:
-        processed = gmail_service.process_email_with_ai(request.message_id)
+        processed = await gmail_service.process_email_with_ai(
+            request.message_id,
+            force=force,
+            stored_body=existing.email_body if existing else None
+        )
         
         if existing:
             existing.subject = processed['subject']
@@ -206,6 +217,49 @@ async def get_email_summary(
     return summary
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: any listed tag, W/ or not, or *"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@router.get("/summary/{email_summary_id}/audio")
+async def get_email_summary_audio(
+    email_summary_id: int,
+    request: Request,
+    user: user_dependency,
+    db: db_dependency
+):
+    summary = db.query(EmailSummary).filter(
+        EmailSummary.id == email_summary_id,
+        EmailSummary.user_id == user.id
+    ).first()
+    
+    if not summary:
+        raise HTTPException(status_code=404, detail="Email summary not found")
+    
+    try:
+        path = await asyncio.to_thread(
+            tts_service.generate_email_summary_audio,
+            summary.summary,
+            summary.subject,
+            summary.sender
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # File names are content hashes, so the name doubles as a strong ETag;
+    # private because the audio reads out the user's email
+    etag = f'"{Path(path).stem}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400, immutable"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return FileResponse(path, media_type="audio/mpeg", headers=headers)
+
+
 @router.post("/send-reply")
 async def send_reply(
     request: SendReplyRequest,
@@ -282,6 +336,42 @@ async def mark_email_as_read(
     return {"message": "Email marked as read"}
 
 
+@router.post("/mark-read")
+async def mark_emails_as_read(
+    request: MarkReadRequest,
+    user: user_dependency,
+    db: db_dependency
+):
+    """Mark several emails as read with a single Gmail batchModify"""
+    email_summaries = db.query(EmailSummary).filter(
+        EmailSummary.id.in_(request.email_summary_ids),
+        EmailSummary.user_id == user.id
+    ).all()
+    
+    if not email_summaries:
+        raise HTTPException(status_code=404, detail="Email summaries not found")
+    
+    gmail_error = None
+    if user.google_access_token:
+        gmail_service = GmailService(user, db)
+        try:
+            gmail_service.mark_as_read_bulk([e.gmail_message_id for e in email_summaries])
+        except Exception as e:
+            logger.error(f"Error marking {len(email_summaries)} emails as read in Gmail for user {user.id}: {e}")
+            gmail_error = str(e)
+    
+    for email_summary in email_summaries:
+        email_summary.is_read = True
+    db.commit()
+    
+    # Marked locally either way; the caller decides whether to retry the Gmail side
+    return {
+        "message": f"{len(email_summaries)} emails marked as read",
+        "gmail_synced": gmail_error is None,
+        "gmail_error": gmail_error
+    }
+
+
 @router.get("/action-items", response_model=List[EmailActionItemResponse])
 async def get_all_action_items(
     user: user_dependency,
@@ -354,9 +444,12 @@ async def summarize_email(
                 "category": existing.category
             }
         
-        # Fetch email from Gmail
+        # Fetch email from Gmail (headers only if the body is already stored)
         gmail_service = GmailService(user, db)
-        email = gmail_service.get_message(request.message_id)
+        email = gmail_service.get_message_with_body(
+            request.message_id,
+            existing.email_body if existing else None
+        )
         
         # Generate new summary
         summary = ai_processor.summarize_email(
@@ -426,14 +519,22 @@ async def draft_reply_streaming(
         raise HTTPException(status_code=400, detail="Gmail not connected")
     
     try:
+        existing = db.query(EmailSummary).filter(
+            EmailSummary.gmail_message_id == request.message_id,
+            EmailSummary.user_id == user.id
+        ).first()
+        
         gmail_service = GmailService(user, db)
-        email = gmail_service.get_message(request.message_id)
+        email = gmail_service.get_message_with_body(
+            request.message_id,
+            existing.email_body if existing else None
+        )
         
         from ...services.ai_processor import ai_processor
         
         # Return streaming response
         return StreamingResponse(
-            ai_processor.draft_reply_stream(
+            ai_processor.stream_reply(
                 email['body'],
                 email['sender'],
                 email['subject']
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, status, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 import asyncio
@@ -6,6 +7,7 @@ from ...services.meeting_service import (
     MeetingService, 
     start_meeting_transcription, 
     stop_meeting_transcription,
+    stream_meeting_summary,
     active_meetings
 )
 from ...services.auth import user_dependency
@@ -18,6 +20,7 @@ from ...schemas.meeting import (
     MeetingSessionResponse
 )
 from ...db.models.meeting import Meeting, MeetingTranscript
+from ...utils.helpers import fast_count
 
 router = APIRouter(prefix='/meetings', tags=['meetings'])
 
@@ -157,8 +160,13 @@ async def get_meeting_transcript(
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
         
-        # Get transcripts
-        transcripts = db.query(MeetingTranscript).filter(
+        # Get transcripts (plain column rows, no ORM objects)
+        transcripts = db.query(
+            MeetingTranscript.sequence_number,
+            MeetingTranscript.timestamp,
+            MeetingTranscript.text,
+            MeetingTranscript.speaker
+        ).filter(
             MeetingTranscript.meeting_id == meeting_id
         ).order_by(MeetingTranscript.sequence_number).all()
         
@@ -230,6 +238,31 @@ async def get_meeting_summary(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{meeting_id}/summary/stream")
+async def stream_summary(
+    meeting_id: int,
+    user: user_dependency,
+    db: db_dependency
+):
+    """Summary JSON streamed as it is generated, so clients can render sections as they arrive"""
+    meeting_service = MeetingService(db)
+    meeting = meeting_service.get_meeting(meeting_id, user.id)
+    
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    if meeting.status not in ["completed", "finalizing"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Meeting must be completed or finalizing to stream its summary"
+        )
+    
+    return StreamingResponse(
+        stream_meeting_summary(meeting_id),
+        media_type="text/plain"
+    )
+
+
 @router.post("/{meeting_id}/summary/retry", response_model=MeetingSummaryResponse)
 async def retry_summary_generation(
     meeting_id: int,
@@ -346,9 +379,7 @@ async def get_meeting_status(
             raise HTTPException(status_code=404, detail="Meeting not found")
         
         # Count transcripts
-        transcript_count = db.query(MeetingTranscript).filter(
-            MeetingTranscript.meeting_id == meeting_id
-        ).count()
+        transcript_count = fast_count(db, MeetingTranscript, MeetingTranscript.meeting_id == meeting_id)
         
         return {
             "meeting_id": meeting.id,
@@ -80,7 +80,7 @@ async def meeting_websocket(
                             "meeting_id": meeting_id,
                             "is_recording": transcription_service.is_running,
                             "sequence_number": transcription_service.sequence_number,
-                            "buffer_size": len(transcription_service.audio_byte_buffer)
+                            "buffer_size": len(transcription_service.pcm)
                         })
                     
                     else:
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, BackgroundTasks, Header, Response
+from typing import Optional
+import logging
+from ...db.base import db_dependency
+from ...db.models.user import User
+from ...services.meeting_service import sync_user_calendar
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix='/webhooks', tags=['webhooks'])
+
+
+@router.post("/gcal")
+async def google_calendar_notification(
+    db: db_dependency,
+    background_tasks: BackgroundTasks,
+    x_goog_channel_id: Optional[str] = Header(None),
+    x_goog_channel_token: Optional[str] = Header(None),
+    x_goog_resource_state: Optional[str] = Header(None)
+):
+    """Google Calendar push notification, pulls only the notifying user's changes"""
+    # Google only checks for a 2xx, anything unknown is acknowledged and ignored
+    if not x_goog_channel_token or not x_goog_channel_token.isdigit():
+        return Response(status_code=200)
+    
+    user = db.get(User, int(x_goog_channel_token))
+    if not user or user.gcal_channel_id != x_goog_channel_id:
+        logger.warning(f"Ignoring calendar notification for unknown channel {x_goog_channel_id}")
+        return Response(status_code=200)
+    
+    # "sync" is the handshake sent when the channel is created
+    if x_goog_resource_state != "sync":
+        background_tasks.add_task(sync_user_calendar, user.id)
+    
+    return Response(status_code=200)
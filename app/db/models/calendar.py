@@ -1,5 +1,5 @@
 from ..base import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -16,4 +16,8 @@ class CalendarEvent(Base):
     location = Column(String, nullable=True)
     synced_at = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="calendar_events")
\ No newline at end of file
+    user = relationship("User", back_populates="calendar_events")
+    
+    __table_args__ = (
+        Index('ix_calendar_user_start', 'user_id', 'start_time'),
+    )
\ No newline at end of file
@@ -1,5 +1,5 @@
 from ..base import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -24,6 +24,10 @@ class EmailSummary(Base):
     # Relationships
     user = relationship("User", back_populates="email_summaries")
     action_items = relationship("EmailActionItem", back_populates="email", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('ix_emailsummary_user_created', 'user_id', 'created_at'),
+    )
 
 
 class EmailActionItem(Base):
@@ -1,5 +1,5 @@
 from ..base import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -15,6 +15,8 @@ class Meeting(Base):
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=True)
     status = Column(String, default="scheduled")  # scheduled, active, completed, failed, finalizing
+    summary_status = Column(String, nullable=True)  # queued, running, done, failed
+    cached_transcript = Column(Text, nullable=True)  # final chunks joined by newlines, appended on each flush
     is_manual = Column(Boolean, default=False)
     last_activity = Column(DateTime, default=datetime.utcnow)  # For grace period tracking
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -24,6 +26,14 @@ class Meeting(Base):
     user = relationship("User", back_populates="meetings")
     transcripts = relationship("MeetingTranscript", back_populates="meeting", cascade="all, delete-orphan")
     summary = relationship("MeetingSummary", back_populates="meeting", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('ix_meeting_user_event', 'user_id', 'calendar_event_id', unique=True),
+        Index('ix_meeting_user_status_start', 'user_id', 'status', 'start_time'),
+        # Partial indexes for the background pollers' fixed predicates
+        Index('ix_meetings_active_lastact', 'last_activity', postgresql_where=(status == 'active')),
+        Index('ix_meetings_scheduled_start', 'start_time', postgresql_where=((status == 'scheduled') & (is_manual == False))),
+    )
 
 
 class MeetingTranscript(Base):
@@ -39,6 +49,11 @@ class MeetingTranscript(Base):
     
     # Relationships
     meeting = relationship("Meeting", back_populates="transcripts")
+    
+    __table_args__ = (
+        Index('ix_transcript_meeting_seq', 'meeting_id', 'sequence_number'),
+        Index('ix_transcript_meeting_final_seq', 'meeting_id', 'sequence_number', postgresql_where=(is_final == True)),
+    )
 
 
 class MeetingSummary(Base):
@@ -47,6 +62,7 @@ class MeetingSummary(Base):
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
     full_transcript = Column(Text, nullable=False)
+    transcript_hash = Column(String(64), nullable=True, index=True)  # sha256 of full_transcript
     key_points = Column(Text, nullable=True)
     decisions = Column(Text, nullable=True)
     action_items = Column(JSON, nullable=True)
@@ -1,11 +1,11 @@
 from ..base import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Date, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 # WAT timezone
-WAT = pytz.timezone('Africa/Lagos')
+WAT = ZoneInfo('Africa/Lagos')
 
 class DailySummary(Base):
     __tablename__ = "daily_summaries"
@@ -35,5 +35,10 @@ class DailySummary(Base):
     
     user = relationship("User", back_populates="daily_summaries")
     
+    __table_args__ = (
+        # One summary per user per day; the nightly job upserts on it
+        UniqueConstraint('user_id', 'summary_date', name='uq_daily_summary_user_date'),
+    )
+    
     def __repr__(self):
         return f"<DailySummary(user_id={self.user_id}, date={self.summary_date})>"
\ No newline at end of file
@@ -1,5 +1,5 @@
 from ..base import Base
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -17,4 +17,11 @@ class Task(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    user = relationship("User", back_populates="tasks")
\ No newline at end of file
+    user = relationship("User", back_populates="tasks")
+    
+    __table_args__ = (
+        # Due-reminder scan only ever looks at pending tasks
+        Index('ix_tasks_due', 'due_date', postgresql_where=((is_notified == False) & (is_completed == False))),
+        # Per-user stats and listings filter on completion and due date
+        Index('ix_tasks_user_completed_due', 'user_id', 'is_completed', 'due_date'),
+    )
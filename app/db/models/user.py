@@ -16,6 +16,11 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     google_access_token = Column(String, nullable=True)
     google_refresh_token = Column(String, nullable=True)
+    # Google Calendar push notification channel and incremental sync state
+    gcal_channel_id = Column(String, nullable=True)
+    gcal_resource_id = Column(String, nullable=True)
+    gcal_channel_expiration = Column(DateTime, nullable=True)
+    gcal_sync_token = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships - Use string references to avoid circular imports
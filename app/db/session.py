@@ -6,8 +6,17 @@ dotenv.load_dotenv()
 #  "sqlite:///./test.db"
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_use_lifo=True
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Background jobs commit inside loops; keeping loaded state avoids a re-SELECT per object after each commit
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def get_db():
     db = SessionLocal()
@@ -49,4 +49,8 @@ class ProcessEmailRequest(BaseModel):
 
 class SendReplyRequest(BaseModel):
     email_summary_id: int
-    custom_reply: Optional[str] = None  # If provided, use this instead of drafted reply
\ No newline at end of file
+    custom_reply: Optional[str] = None  # If provided, use this instead of drafted reply
+
+
+class MarkReadRequest(BaseModel):
+    email_summary_ids: List[int]
@@ -17,6 +17,7 @@ class MeetingResponse(BaseModel):
     start_time: datetime
     end_time: Optional[datetime]
     status: str  # scheduled, active, completed, failed
+    summary_status: Optional[str] = None  # queued, running, done, failed
     is_manual: bool
     created_at: datetime
     
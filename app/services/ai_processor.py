@@ -1,17 +1,56 @@
 import os
-from openai import OpenAI
-from typing import Dict, List, AsyncGenerator
+import re
+from concurrent.futures import ThreadPoolExecutor
+from openai import AsyncOpenAI, OpenAI
+from typing import Dict, List, AsyncGenerator, Optional
 import dotenv
 
 dotenv.load_dotenv()
 
 client = OpenAI(api_key="anything", base_url="http://localhost:12434/engines/v1")
+async_client = AsyncOpenAI(api_key="anything", base_url="http://localhost:12434/engines/v1")
+
+# Blocking LLM calls get their own pool so slow responses can't starve the default executor
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "4"))
+ai_executor = ThreadPoolExecutor(
+    max_workers=min(32, 2 * OPENAI_MAX_CONCURRENCY),
+    thread_name_prefix="ai-summary"
+)
+
+# Bullet lines ("- item", "* item", "• item") in LLM list output
+_BULLET_RE = re.compile(r'(?m)^\s*[-*•]\s*(.+?)\s*$')
+
+EMAIL_CATEGORIES = ("urgent", "work", "personal", "promotional", "spam", "newsletter")
+
+# The first four letters are unique per category, so a truncated decode is enough
+_CATEGORY_BY_PREFIX = {category[:4]: category for category in EMAIL_CATEGORIES}
+
+# Signals that make a bulk-mail classification certain without asking the model
+_NOREPLY_RE = re.compile(r'\b(noreply|no-reply|donotreply|do-not-reply)@', re.I)
+_NEWSLETTER_HINTS = ("unsubscribe", "newsletter", "mailchimp", "view in browser")
+
+# System messages are shared across calls; the client only reads them
+_SUMMARIZE_SYSTEM = {"role": "system", "content": "You summarize emails concisely in plain text without extra formatting or introductions."}
+_REPLY_SYSTEM = {"role": "system", "content": "You are a professional email assistant that drafts clear, courteous replies."}
+_CATEGORIZE_SYSTEM = {"role": "system", "content": "You categorize emails efficiently."}
+_ACTION_ITEMS_SYSTEM = {"role": "system", "content": "You extract action items from emails."}
+
+
+def _rule_based_category(email_content: str, subject: str) -> Optional[str]:
+    # Unsubscribe footers sit at the end of the body, so look at both ends
+    edges = (email_content[:1000] + email_content[-1000:]).lower()
+    if not any(hint in edges for hint in _NEWSLETTER_HINTS):
+        return None
+    if _NOREPLY_RE.search(email_content[:500]) or "newsletter" in subject.lower():
+        return "newsletter"
+    return None
 
 
 class AIProcessor:
 
     def __init__(self):
         self.client = client
+        self.async_client = async_client
         self.model = "ai/llama3.2:1B-Q4_0"
 
     def summarize_email(self, email_content: str, sender: str, subject: str) -> str:
@@ -31,7 +70,7 @@ class AIProcessor:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You summarize emails concisely in plain text without extra formatting or introductions."},
+                    _SUMMARIZE_SYSTEM,
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
@@ -58,10 +97,10 @@ class AIProcessor:
             Provide ONLY the summary without any introduction or extra formatting.
             """
 
-            stream = self.client.chat.completions.create(
+            stream = await self.async_client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You summarize emails concisely in plain text without extra formatting or introductions."},
+                    _SUMMARIZE_SYSTEM,
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
@@ -69,7 +108,7 @@ class AIProcessor:
                 stream=True
             )
 
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
@@ -103,7 +142,7 @@ class AIProcessor:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a professional email assistant that drafts clear, courteous replies."},
+                    _REPLY_SYSTEM,
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.8,
@@ -139,10 +178,10 @@ class AIProcessor:
             Draft Reply:
             """
 
-            stream = self.client.chat.completions.create(
+            stream = await self.async_client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a professional email assistant that drafts clear, courteous replies."},
+                    _REPLY_SYSTEM,
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.8,
@@ -150,7 +189,7 @@ class AIProcessor:
                 stream=True
             )
 
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
@@ -160,6 +199,10 @@ class AIProcessor:
 
     def categorize_email(self, email_content: str, subject: str) -> str:
 
+        rule_category = _rule_based_category(email_content, subject)
+        if rule_category:
+            return rule_category
+
         try:
             prompt = f"""
             Categorize this email into ONE of these categories:
@@ -179,14 +222,15 @@ class AIProcessor:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You categorize emails efficiently."},
+                    _CATEGORIZE_SYSTEM,
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3,
-                max_tokens=10
+                temperature=0,
+                max_tokens=3
             )
 
-            return response.choices[0].message.content.strip().lower()
+            answer = response.choices[0].message.content.strip().lower().lstrip('-*• ')
+            return _CATEGORY_BY_PREFIX.get(answer[:4], "uncategorized")
 
         except Exception as e:
             print(f"Error categorizing email: {e}")
@@ -206,7 +250,7 @@ class AIProcessor:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You extract action items from emails."},
+                    _ACTION_ITEMS_SYSTEM,
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.5,
@@ -218,8 +262,10 @@ class AIProcessor:
             if result.lower() == "none":
                 return []
             
-            # Parse bullet points
-            items = [line.strip('- ').strip() for line in result.split('\n') if line.strip()]
+            # Parse bullet points, falling back to one item per line
+            items = _BULLET_RE.findall(result)
+            if not items:
+                items = [line.strip() for line in result.splitlines() if line.strip()]
             return items
 
         except Exception as e:
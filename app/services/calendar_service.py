@@ -6,19 +6,46 @@ from sqlalchemy.orm import Session
 from ..db.models.user import User
 from ..db.models.calendar import CalendarEvent
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional
 import os
+import re
+import time
+import uuid
 import dotenv
 dotenv.load_dotenv()
 
 # Match EXACTLY the scopes from auth.py
-CALENDAR_SCOPES = [
+CALENDAR_SCOPES = (
     'openid',
     'email',
     'profile',
     'https://www.googleapis.com/auth/calendar',
-    'https://www.googleapis.com/auth/gmail.modify'
-]
+    'https://www.googleapis.com/auth/gmail.modify',
+)
+
+# Push notifications need a publicly reachable URL; without one the poller does all the work
+PUBLIC_URL = os.environ.get("PUBLIC_URL")
+GCAL_WEBHOOK_URL = f"{PUBLIC_URL.rstrip('/')}/webhooks/gcal" if PUBLIC_URL else None
+
+# Only what meeting sync reads; incremental pages otherwise carry full event payloads
+EVENT_SYNC_FIELDS = 'nextPageToken,nextSyncToken,items(id,status,summary,hangoutLink,start/dateTime)'
+
+# Address part of a "Name <addr@example.com>" sender string
+_EMAIL_RE = re.compile(r'<([^>]+)>')
+
+
+@lru_cache(maxsize=1)
+def _utc_z_second(second: int) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(second))
+
+
+def _utc_z(dt: datetime = None) -> str:
+    # RFC3339 UTC timestamp; "now" is cached per second since the API ignores sub-second precision
+    if dt is None:
+        return _utc_z_second(int(time.time()))
+    return dt.isoformat() + 'Z'
+
 
 class GoogleCalendarService:
     def __init__(self, user: User, db: Session = None):
@@ -73,19 +100,16 @@ class GoogleCalendarService:
     ) -> List[Dict]:
         # Fetch events from Google Calendar
         try:
-            if not time_min:
-                time_min = datetime.utcnow()
-            
             params = {
                 'calendarId': calendar_id,
-                'timeMin': time_min.isoformat() + 'Z',
+                'timeMin': _utc_z(time_min),
                 'maxResults': max_results,
                 'singleEvents': True,
                 'orderBy': 'startTime'
             }
             
             if time_max:
-                params['timeMax'] = time_max.isoformat() + 'Z'
+                params['timeMax'] = _utc_z(time_max)
             
             if query:
                 params['q'] = query
@@ -99,6 +123,86 @@ class GoogleCalendarService:
         except HttpError as error:
             raise Exception(f"An error occurred: {error}")
     
+    def sync_events_request(self, sync_token: str = None, page_token: str = None, calendar_id: str = 'primary'):
+        """Unexecuted events.list request for one sync page, so callers can batch it"""
+        params = {
+            'calendarId': calendar_id,
+            'singleEvents': True,
+            'maxResults': 250,
+            'fields': EVENT_SYNC_FIELDS
+        }
+        if sync_token:
+            params['syncToken'] = sync_token
+        if page_token:
+            params['pageToken'] = page_token
+        return self.service.events().list(**params)
+    
+    def sync_events(self, sync_token: str = None, calendar_id: str = 'primary', first_page: Dict = None):
+        """Incremental events.list, returns (changed events, next sync token)"""
+        events = []
+        try:
+            # first_page is a response already fetched through a batch request
+            result = first_page or self.sync_events_request(sync_token, calendar_id=calendar_id).execute()
+            while True:
+                events.extend(result.get('items', []))
+                if not result.get('nextPageToken'):
+                    break
+                result = self.sync_events_request(sync_token, result['nextPageToken'], calendar_id).execute()
+            
+            self.refresh_tokens()
+            return events, result.get('nextSyncToken')
+        except RefreshError as error:
+            raise Exception(f"Token refresh failed. User needs to re-authenticate: {error}")
+        except HttpError as error:
+            # 410 Gone means the sync token expired and a full sync is required
+            if sync_token and error.resp.status == 410:
+                return self.sync_events(None, calendar_id)
+            raise Exception(f"An error occurred: {error}")
+    
+    def stop_watch(self, channel_id: str, resource_id: str):
+        """Stop a push notification channel; an already expired one is fine"""
+        try:
+            self.service.channels().stop(body={'id': channel_id, 'resourceId': resource_id}).execute()
+        except HttpError as error:
+            if error.resp.status != 404:
+                raise Exception(f"An error occurred: {error}")
+    
+    def ensure_watch(self, calendar_id: str = 'primary'):
+        """Register (or renew) a push notification channel for the user's calendar"""
+        if not GCAL_WEBHOOK_URL or not self.db:
+            return
+        
+        expires_soon = datetime.utcnow() + timedelta(days=1)
+        if self.user.gcal_channel_id and self.user.gcal_channel_expiration and self.user.gcal_channel_expiration > expires_soon:
+            return
+        
+        try:
+            channel = self.service.events().watch(
+                calendarId=calendar_id,
+                body={
+                    'id': str(uuid.uuid4()),
+                    'type': 'web_hook',
+                    'address': GCAL_WEBHOOK_URL,
+                    'token': str(self.user.id)
+                }
+            ).execute()
+            
+            self.refresh_tokens()
+            
+            old_channel = (self.user.gcal_channel_id, self.user.gcal_resource_id)
+            self.user.gcal_channel_id = channel['id']
+            self.user.gcal_resource_id = channel['resourceId']
+            self.user.gcal_channel_expiration = datetime.utcfromtimestamp(int(channel['expiration']) / 1000)
+            self.db.commit()
+            
+            # The old channel would keep sending notifications until it expires
+            if all(old_channel):
+                self.stop_watch(*old_channel)
+        except RefreshError as error:
+            raise Exception(f"Token refresh failed. User needs to re-authenticate: {error}")
+        except HttpError as error:
+            raise Exception(f"An error occurred: {error}")
+    
     def get_event(self, event_id: str, calendar_id: str = 'primary') -> Dict:
         try:
             event = self.service.events().get(
@@ -161,7 +265,7 @@ class GoogleCalendarService:
             if conference_data:
                 event['conferenceData'] = {
                     'createRequest': {
-                        'requestId': f"meet-{datetime.utcnow().timestamp()}",
+                        'requestId': f"meet-{time.time()}",
                         'conferenceSolutionKey': {'type': 'hangoutsMeet'}
                     }
                 }
@@ -201,9 +305,8 @@ class GoogleCalendarService:
         end_time = suggested_time + timedelta(minutes=duration_minutes)
         
         # Extract email from sender string
-        sender_email = email_sender
-        if '<' in email_sender:
-            sender_email = email_sender.split('<')[1].strip('>')
+        match = _EMAIL_RE.search(email_sender)
+        sender_email = match.group(1) if match else email_sender
         
         title = f"Meeting: {subject}"
         if not description:
@@ -297,8 +400,8 @@ class GoogleCalendarService:
             
             # Get busy times from freebusy query
             body = {
-                "timeMin": time_min.isoformat() + 'Z',
-                "timeMax": time_max.isoformat() + 'Z',
+                "timeMin": _utc_z(time_min),
+                "timeMax": _utc_z(time_max),
                 "items": [{"id": "primary"}]
             }
             
@@ -1,26 +1,44 @@
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from google.auth.transport.requests import Request as GoogleAuthRequest
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 from google.auth.exceptions import RefreshError
 from email.mime.text import MIMEText
+import asyncio
 import base64
+import hashlib
+import json
 import os
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 import dotenv
+import httplib2
+import httpx
+from cachetools import TTLCache
+from functools import lru_cache
 from typing import List, Dict, Optional
 import re
-from bs4 import BeautifulSoup
-from .ai_processor import ai_processor
+from selectolax.parser import HTMLParser
+from ..db.models.user import User
+from ..db.session import SessionLocal
+from .ai_processor import ai_processor, ai_executor
+from ..utils.logger import get_logger
 
 dotenv.load_dotenv()
 
+logger = get_logger(__name__)
+
 # Match EXACTLY the scopes from auth.py OAuth registration
-GMAIL_SCOPES = [
+GMAIL_SCOPES = (
     'openid',
     'email',
     'profile',
     'https://www.googleapis.com/auth/calendar',
-    'https://www.googleapis.com/auth/gmail.modify'
-]
+    'https://www.googleapis.com/auth/gmail.modify',
+)
 
 # Gmail category labels
 GMAIL_CATEGORIES = {
@@ -33,6 +51,41 @@ GMAIL_CATEGORIES = {
     'TRASH': 'trash'
 }
 
+_CATEGORY_LABELS = frozenset(GMAIL_CATEGORIES)
+_NO_PRIORITY_LABELS = frozenset({'SPAM', 'TRASH'})
+_INBOX_UNREAD_LABELS = frozenset({'INBOX', 'UNREAD'})
+_REPLY_CATEGORIES = frozenset({'primary', 'unknown'})
+
+# Sent, draft and trashed messages never need triage, so Gmail drops them before listing
+UNREAD_QUERY = "is:unread -in:sent -in:draft -in:trash"
+
+# Complete list query per supported category filter
+UNREAD_QUERY_BY_CATEGORY = {
+    category: f"{UNREAD_QUERY} category:{category}"
+    for category in ('primary', 'social', 'promotions', 'updates', 'forums')
+}
+
+BASIC_METADATA_HEADERS = ['Subject', 'From', 'Date']
+
+# Partial-response selectors: only the fields the service actually reads
+LIST_FIELDS = 'messages/id,nextPageToken,resultSizeEstimate'
+METADATA_FIELDS = 'id,threadId,labelIds,snippet,payload/headers'
+# Parts are selected three levels deep: multipart/alternative inside multipart/mixed, plus forwards
+FULL_FIELDS = (
+    'id,threadId,labelIds,snippet,'
+    'payload(headers,mimeType,body/data,'
+    'parts(mimeType,body/data,parts(mimeType,body/data,parts(mimeType,body/data))))'
+)
+FIELDS_BY_FORMAT = {'metadata': METADATA_FIELDS, 'full': FULL_FIELDS}
+
+# users.messages.batchModify accepts at most 1000 ids per call
+GMAIL_BATCH_MODIFY_LIMIT = 1000
+
+# Seconds before a Gmail HTTP call is abandoned
+GMAIL_HTTP_TIMEOUT = 30
+
+GMAIL_API_BASE = "https://gmail.googleapis.com/gmail/v1/users/me"
+
 # Priority mapping - higher number = higher priority
 PRIORITY_SCORES = {
     'primary': 5,
@@ -45,6 +98,134 @@ PRIORITY_SCORES = {
     'unknown': 3
 }
 
+_thread_local = threading.local()
+
+# Pooled async client for concurrent Gmail REST fan-out (googleapiclient is blocking)
+_async_http = httpx.AsyncClient(
+    base_url=GMAIL_API_BASE,
+    timeout=GMAIL_HTTP_TIMEOUT,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+)
+
+# Gmail allows ~250 quota units/s per user; keep the fan-out well under that
+GMAIL_MAX_CONCURRENCY = 10
+GMAIL_MAX_RETRIES = 3
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_gmail_slots = asyncio.Semaphore(GMAIL_MAX_CONCURRENCY)
+
+
+async def _gmail_get(url: str, **kwargs) -> httpx.Response:
+    """GET through the pooled client, retrying rate limits and 5xx with exponential backoff"""
+    for attempt in range(GMAIL_MAX_RETRIES + 1):
+        async with _gmail_slots:
+            response = await _async_http.get(url, **kwargs)
+        if response.status_code not in _RETRYABLE_STATUS or attempt == GMAIL_MAX_RETRIES:
+            break
+        retry_after = response.headers.get('Retry-After', '')
+        await asyncio.sleep(float(retry_after) if retry_after.isdigit() else 2 ** attempt)
+    response.raise_for_status()
+    return response
+
+
+async def close_async_http():
+    await _async_http.aclose()
+
+
+# In-flight OAuth refreshes keyed by user id, so concurrent requests share one round trip
+_refresh_lock = threading.Lock()
+_refresh_inflight: Dict[int, Future] = {}
+
+
+class SharedRefreshCredentials(Credentials):
+    """Credentials whose concurrent refreshes for the same user collapse into one"""
+
+    user_id: Optional[int] = None
+
+    def refresh(self, request):
+        if self.user_id is None:
+            return super().refresh(request)
+
+        with _refresh_lock:
+            inflight = _refresh_inflight.get(self.user_id)
+            if inflight is None:
+                owner = True
+                inflight = _refresh_inflight[self.user_id] = Future()
+            else:
+                owner = False
+
+        if not owner:
+            self.token, self.expiry = inflight.result()
+            return
+
+        try:
+            super().refresh(request)
+            inflight.set_result((self.token, self.expiry))
+        except Exception as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            with _refresh_lock:
+                _refresh_inflight.pop(self.user_id, None)
+
+
+# Rotated tokens are persisted off the request path; a lost write only costs one extra refresh
+_token_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gmail-token-writer")
+
+
+def _persist_tokens(user_id: int, access_token: str, refresh_token: Optional[str]):
+    db = SessionLocal()
+    try:
+        values = {User.google_access_token: access_token}
+        if refresh_token:
+            values[User.google_refresh_token] = refresh_token
+        db.query(User).filter(User.id == user_id).update(values, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating Google tokens in database for user {user_id}: {e}")
+    finally:
+        db.close()
+
+
+# AI results keyed by message id + body digest; message bodies are immutable
+_ai_results_cache: TTLCache = TTLCache(maxsize=512, ttl=30 * 24 * 3600)
+
+# One Credentials object per user, so a refresh done by one request is reused by the next
+_creds_cache: TTLCache = TTLCache(maxsize=1024, ttl=3300)
+_creds_lock = threading.RLock()
+
+
+def _credentials_for(user) -> SharedRefreshCredentials:
+    with _creds_lock:
+        creds = _creds_cache.get(user.id)
+        if creds is None or creds.refresh_token != user.google_refresh_token:
+            # Use the EXACT same scopes that were authorized during OAuth
+            creds = SharedRefreshCredentials(
+                token=user.google_access_token,
+                refresh_token=user.google_refresh_token,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=os.environ.get("GOOGLE_CLIENT_ID"),
+                client_secret=os.environ.get("GOOGLE_CLIENT_SECRET"),
+                scopes=GMAIL_SCOPES
+            )
+            creds.user_id = user.id
+            _creds_cache[user.id] = creds
+        return creds
+
+
+@lru_cache(maxsize=1)
+def _gmail_discovery_doc() -> Dict:
+    # Parse the discovery document bundled with googleapiclient once per process
+    return json.loads(get_static_doc('gmail', 'v1'))
+
+
+def _shared_http() -> httplib2.Http:
+    # httplib2.Http is not thread-safe, so keep-alive connections are pooled per thread
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = _thread_local.http = httplib2.Http(timeout=GMAIL_HTTP_TIMEOUT)
+    return http
+
 
 class GmailService:
     def __init__(self, user, db=None):
@@ -54,47 +235,42 @@ class GmailService:
         if not user.google_refresh_token:
             raise ValueError("User does not have a valid Google refresh token")
         
-        # Use the EXACT same scopes that were authorized during OAuth
-        self.creds = Credentials(
-            token=user.google_access_token,
-            refresh_token=user.google_refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=os.environ.get("GOOGLE_CLIENT_ID"),
-            client_secret=os.environ.get("GOOGLE_CLIENT_SECRET"),
-            scopes=GMAIL_SCOPES
-        )
+        self.creds = _credentials_for(user)
+        # Compare against the stored token so a refresh done by another request still gets persisted
+        self._last_known_token = user.google_access_token
         
         try:
-            self.service = build('gmail', 'v1', credentials=self.creds)
+            self.service = build_from_document(
+                _gmail_discovery_doc(),
+                http=AuthorizedHttp(self.creds, http=_shared_http())
+            )
         except Exception as e:
             raise ValueError(f"Failed to build Gmail service: {str(e)}")
 
     def refresh_tokens_if_needed(self):
-        try:
-            if self.db and self.creds.token != self.user.google_access_token:
-                self.user.google_access_token = self.creds.token
-                # Refresh token usually doesn't change, but update if it does
-                if self.creds.refresh_token and self.creds.refresh_token != self.user.google_refresh_token:
-                    self.user.google_refresh_token = self.creds.refresh_token
-                self.db.commit()
-                self.db.refresh(self.user)
-        except Exception as e:
-            print(f"Error updating tokens in database: {e}")
+        # Only touch the DB when google-auth actually swapped in a new access token
+        if self.creds.token == self._last_known_token:
+            return
+        if self.db:
+            _token_writer.submit(_persist_tokens, self.user.id, self.creds.token, self.creds.refresh_token)
+        self._last_known_token = self.creds.token
 
     def get_category_from_labels(self, labels: List[str]) -> str:
         if not labels:
             return 'unknown'
         
-        for label in labels:
-            if label in GMAIL_CATEGORIES:
-                return GMAIL_CATEGORIES[label]
+        # Keep Gmail's label order when several category labels are present
+        if not _CATEGORY_LABELS.isdisjoint(labels):
+            for label in labels:
+                if label in _CATEGORY_LABELS:
+                    return GMAIL_CATEGORIES[label]
         
-        if 'INBOX' in labels and 'UNREAD' in labels:
+        if _INBOX_UNREAD_LABELS.issubset(labels):
             return 'primary'
         
         return 'unknown'
 
-    def calculate_priority(self, category: str, labels: List[str], sender: str = '') -> int:
+    def calculate_priority(self, category: str, labels: frozenset, sender: str = '') -> int:
         base_priority = PRIORITY_SCORES.get(category, 3)
         
         if 'IMPORTANT' in labels:
@@ -103,7 +279,7 @@ class GmailService:
         if 'STARRED' in labels:
             base_priority += 2
         
-        if 'SPAM' in labels or 'TRASH' in labels:
+        if not _NO_PRIORITY_LABELS.isdisjoint(labels):
             base_priority = 0
         
         # You can add more rules here
@@ -126,7 +302,7 @@ class GmailService:
             if page_token:
                 params['pageToken'] = page_token
             
-            results = self.service.users().messages().list(**params).execute()
+            results = self.service.users().messages().list(fields=LIST_FIELDS, **params).execute()
             
             self.refresh_tokens_if_needed()
             
@@ -146,61 +322,132 @@ class GmailService:
                 userId='me',
                 id=message_id,
                 format='metadata',
-                metadataHeaders=['Subject', 'From', 'Date']
+                metadataHeaders=BASIC_METADATA_HEADERS,
+                fields=METADATA_FIELDS
             ).execute()
 
-            headers = message['payload']['headers']
-            subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), 'No Subject')
-            sender = next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown')
-            date = next((h['value'] for h in headers if h['name'].lower() == 'date'), '')
-
-            labels = message.get('labelIds', [])
-            category = self.get_category_from_labels(labels)
-            priority = self.calculate_priority(category, labels, sender)
-            
-            # Determine if reply is needed
-            requires_reply = category in ['primary', 'unknown'] and 'SENT' not in labels
-
             self.refresh_tokens_if_needed()
 
-            return {
-                'id': message_id,
-                'subject': subject,
-                'sender': sender,
-                'date': date,
-                'snippet': message.get('snippet', ''),
-                'thread_id': message.get('threadId', ''),
-                'labels': labels,
-                'category': category,
-                'priority': priority,
-                'requires_reply': requires_reply,
-                'is_important': 'IMPORTANT' in labels,
-                'is_starred': 'STARRED' in labels
-            }
+            return self.build_basic_info(message)
         except RefreshError as error:
             raise Exception(f"Token refresh failed. User needs to re-authenticate: {error}")
         except HttpError as error:
             raise Exception(f"An error occurred: {error}")
 
+    def build_basic_info(self, message: Dict) -> Dict:
+        headers = self.headers_by_name(message)
+        subject = headers.get('subject', 'No Subject')
+        sender = headers.get('from', 'Unknown')
+        date = headers.get('date', '')
+
+        labels = message.get('labelIds', [])
+        label_set = frozenset(labels)
+        category = self.get_category_from_labels(labels)
+        priority = self.calculate_priority(category, label_set, sender)
+        
+        # Determine if reply is needed
+        requires_reply = category in _REPLY_CATEGORIES and 'SENT' not in label_set
+
+        return {
+            'id': message['id'],
+            'subject': subject,
+            'sender': sender,
+            'date': date,
+            'snippet': message.get('snippet', ''),
+            'thread_id': message.get('threadId', ''),
+            'labels': labels,
+            'category': category,
+            'priority': priority,
+            'requires_reply': requires_reply,
+            'is_important': 'IMPORTANT' in label_set,
+            'is_starred': 'STARRED' in label_set
+        }
+
+    def headers_by_name(self, message: Dict) -> Dict[str, str]:
+        """Map lower-cased header names to values (first occurrence wins, as before)"""
+        headers = {}
+        for header in message['payload']['headers']:
+            headers.setdefault(header['name'].lower(), header['value'])
+        return headers
+
+    async def _async_auth_headers(self) -> Dict[str, str]:
+        if not self.creds.valid:
+            try:
+                await asyncio.to_thread(self.creds.refresh, GoogleAuthRequest())
+            except RefreshError as error:
+                raise Exception(f"Token refresh failed. User needs to re-authenticate: {error}")
+        return {'Authorization': f'Bearer {self.creds.token}'}
+
+    async def list_messages_async(self, max_results=10, query="is:unread", page_token=None):
+        """Async counterpart of list_messages over the pooled httpx client"""
+        headers = await self._async_auth_headers()
+        params = {'maxResults': max_results, 'q': query, 'fields': LIST_FIELDS}
+        if page_token:
+            params['pageToken'] = page_token
+
+        try:
+            response = await _gmail_get("/messages", params=params, headers=headers)
+        except httpx.HTTPError as error:
+            raise Exception(f"An error occurred: {error}")
+        results = response.json()
+
+        self.refresh_tokens_if_needed()
+        return {
+            'messages': results.get('messages', []),
+            'next_page_token': results.get('nextPageToken'),
+            'result_size_estimate': results.get('resultSizeEstimate', 0)
+        }
+
+    async def fetch_messages_async(
+        self,
+        message_ids: List[str],
+        fmt: str = 'metadata',
+        metadata_headers: List[str] = None
+    ) -> Dict[str, Dict]:
+        """Fetch many messages concurrently without blocking the event loop"""
+        headers = await self._async_auth_headers()
+
+        params = [('format', fmt)]
+        if fmt in FIELDS_BY_FORMAT:
+            params.append(('fields', FIELDS_BY_FORMAT[fmt]))
+        for header in metadata_headers or ():
+            params.append(('metadataHeaders', header))
+
+        async def fetch(message_id: str):
+            try:
+                response = await _gmail_get(f"/messages/{message_id}", params=params, headers=headers)
+                return message_id, response.json()
+            except httpx.HTTPError as e:
+                logger.warning(f"Error fetching email {message_id}: {e}")
+                return message_id, None
+
+        # _gmail_slots bounds the fan-out, so every id can be queued at once
+        results = await asyncio.gather(*(fetch(message_id) for message_id in message_ids))
+        messages = {message_id: message for message_id, message in results if message is not None}
+
+        self.refresh_tokens_if_needed()
+        return messages
+
     def get_message(self, message_id: str) -> Dict:
         try:
             message = self.service.users().messages().get(
                 userId='me',
                 id=message_id,
-                format='full'
+                format='full',
+                fields=FULL_FIELDS
             ).execute()
 
-            headers = message['payload']['headers']
-            subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), 'No Subject')
-            sender = next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown')
-            date = next((h['value'] for h in headers if h['name'].lower() == 'date'), '')
+            headers = self.headers_by_name(message)
+            subject = headers.get('subject', 'No Subject')
+            sender = headers.get('from', 'Unknown')
+            date = headers.get('date', '')
 
             # Extract body
             body = self.extract_body(message['payload'])
             
             labels = message.get('labelIds', [])
             category = self.get_category_from_labels(labels)
-            priority = self.calculate_priority(category, labels, sender)
+            priority = self.calculate_priority(category, frozenset(labels), sender)
             
             self.refresh_tokens_if_needed()
 
@@ -221,29 +468,50 @@ class GmailService:
         except HttpError as error:
             raise Exception(f"An error occurred: {error}")
 
+    def get_message_with_body(self, message_id: str, stored_body: Optional[str] = None) -> Dict:
+        """Message with body; the format=full MIME tree is only downloaded when no stored body exists"""
+        if stored_body is None:
+            return self.get_message(message_id)
+
+        email = self.get_message_basic(message_id)
+        email['body'] = stored_body
+        return email
+
     def extract_body(self, payload: Dict) -> str:
-        body = ""
-
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    if 'data' in part['body']:
-                        body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                        break
-                elif part['mimeType'] == 'text/html':
-                    if 'data' in part['body']:
-                        html_body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                        body = self.html_to_text(html_body)
-        else:
-            if 'body' in payload and 'data' in payload['body']:
-                body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8')
-
-        return body.strip()
+        # Prefer text/plain; only decode and parse HTML when no plain part exists
+        plain_part = self.find_part(payload, 'text/plain')
+        if plain_part:
+            return self.decode_part(plain_part).strip()
+
+        html_part = self.find_part(payload, 'text/html')
+        if html_part:
+            return self.html_to_text(self.decode_part(html_part)).strip()
+
+        if 'data' in payload.get('body', {}):
+            return self.decode_part(payload).strip()
+
+        return ""
+
+    def find_part(self, payload: Dict, mime_type: str) -> Optional[Dict]:
+        """Depth-first search for a part with data, descending into nested multipart/* parts"""
+        if payload.get('mimeType') == mime_type and 'data' in payload.get('body', {}):
+            return payload
+        for part in payload.get('parts', ()):
+            found = self.find_part(part, mime_type)
+            if found:
+                return found
+        return None
+
+    def decode_part(self, part: Dict) -> str:
+        return base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='replace')
 
     def html_to_text(self, html: str) -> str:
         """Convert HTML to plain text"""
-        soup = BeautifulSoup(html, 'html.parser')
-        return soup.get_text(separator='\n', strip=True)
+        tree = HTMLParser(html)
+        for tag in tree.css('script, style'):
+            tag.decompose()
+        root = tree.body or tree.root
+        return root.text(separator='\n', strip=True) if root else ''
 
     def mark_as_read(self, message_id: str):
         """Mark email as read"""
@@ -259,6 +527,23 @@ class GmailService:
         except HttpError as error:
             raise Exception(f"An error occurred: {error}")
 
+    def mark_as_read_bulk(self, message_ids: List[str]):
+        """Mark many emails as read with one batchModify call per 1000 ids"""
+        try:
+            for start in range(0, len(message_ids), GMAIL_BATCH_MODIFY_LIMIT):
+                self.service.users().messages().batchModify(
+                    userId='me',
+                    body={
+                        'ids': message_ids[start:start + GMAIL_BATCH_MODIFY_LIMIT],
+                        'removeLabelIds': ['UNREAD']
+                    }
+                ).execute()
+            self.refresh_tokens_if_needed()
+        except RefreshError as error:
+            raise Exception(f"Token refresh failed. User needs to re-authenticate: {error}")
+        except HttpError as error:
+            raise Exception(f"An error occurred: {error}")
+
     def send_email(self, to: str, subject: str, body: str, reply_to_message_id: str = None, is_html: bool = True):
 
         try:
@@ -273,11 +558,11 @@ class GmailService:
                     userId='me',
                     id=reply_to_message_id,
                     format='metadata',
-                    metadataHeaders=['Message-ID']
+                    metadataHeaders=['Message-ID'],
+                    fields='payload/headers'
                 ).execute()
 
-                headers = original['payload']['headers']
-                message_id = next((h['value'] for h in headers if h['name'].lower() == 'message-id'), None)
+                message_id = self.headers_by_name(original).get('message-id')
 
                 if message_id:
                     message['In-Reply-To'] = message_id
@@ -296,7 +581,7 @@ class GmailService:
         except HttpError as error:
             raise Exception(f"An error occurred: {error}")
 
-    def list_unread_emails_paginated(
+    async def list_unread_emails_paginated(
         self, 
         max_results: int = 20, 
         page_token: str = None,
@@ -306,82 +591,99 @@ class GmailService:
         List unread emails with pagination and optional category filter - NO AI processing
         Returns basic info only for fast loading, SORTED BY PRIORITY
         """
-        # Build query
-        query = "is:unread"
+        query = UNREAD_QUERY_BY_CATEGORY.get(category_filter, UNREAD_QUERY)
         
-        # Add category filter if specified
-        if category_filter:
-            if category_filter == 'primary':
-                query += " category:primary"
-            elif category_filter == 'social':
-                query += " category:social"
-            elif category_filter == 'promotions':
-                query += " category:promotions"
-            elif category_filter == 'updates':
-                query += " category:updates"
-            elif category_filter == 'forums':
-                query += " category:forums"
+        result = await self.list_messages_async(
+            max_results=max_results,
+            query=query,
+            page_token=page_token
+        )
         
-        result = self.list_messages(max_results=max_results, query=query, page_token=page_token)
+        message_ids = [msg['id'] for msg in result['messages']]
+        fetched = await self.fetch_messages_async(message_ids, 'metadata', BASIC_METADATA_HEADERS)
         
         emails = []
-        for msg in result['messages']:
-            try:
-                email_info = self.get_message_basic(msg['id'])
-                emails.append(email_info)
-            except Exception as e:
-                print(f"Error fetching email {msg['id']}: {e}")
-                continue
+        for message_id in message_ids:
+            if message_id in fetched:
+                emails.append(self.build_basic_info(fetched[message_id]))
         
         # Sort by priority (highest first), then by date
         emails.sort(key=lambda x: x['priority'], reverse=True)
         
-        # Group by category for better organization
+        # Group by priority band and count categories in one pass
+        high_priority, medium_priority, low_priority = [], [], []
+        category_counts = Counter()
+        for email in emails:
+            priority = email['priority']
+            if priority >= 6:
+                high_priority.append(email)
+            elif priority >= 3:
+                medium_priority.append(email)
+            else:
+                low_priority.append(email)
+            category_counts[email['category']] += 1
+        
         categorized_emails = {
-            'high_priority': [e for e in emails if e['priority'] >= 6],
-            'medium_priority': [e for e in emails if 3 <= e['priority'] < 6],
-            'low_priority': [e for e in emails if e['priority'] < 3],
+            'high_priority': high_priority,
+            'medium_priority': medium_priority,
+            'low_priority': low_priority,
             'all': emails
         }
         
-        # Category counts
-        category_counts = {}
-        for email in emails:
-            cat = email['category']
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-        
         return {
             'emails': emails,
             'categorized': categorized_emails,
-            'category_counts': category_counts,
+            'category_counts': dict(category_counts),
             'next_page_token': result.get('next_page_token'),
             'total_estimate': result.get('result_size_estimate', 0),
             'count': len(emails)
         }
 
-    def process_email_with_ai(self, message_id: str) -> Dict:
-
-        email = self.get_message(message_id)
-
-        # AI Processing
-        summary = ai_processor.summarize_email(
-            email['body'],
-            email['sender'],
-            email['subject']
-        )
-
-        drafted_reply = ai_processor.draft_reply(
-            email['body'],
-            email['sender'],
-            email['subject']
-        )
-
-        ai_category = ai_processor.categorize_email(
-            email['body'],
-            email['subject']
-        )
+    async def process_email_with_ai(
+        self,
+        message_id: str,
+        force: bool = False,
+        stored_body: Optional[str] = None
+    ) -> Dict:
 
-        action_items = ai_processor.extract_action_items(email['body'])
+        email = self.get_message_with_body(message_id, stored_body)
+
+        body_digest = hashlib.blake2b(email['body'].encode('utf-8'), digest_size=16).hexdigest()
+        cache_key = f"{message_id}:{body_digest}"
+
+        cached = None if force else _ai_results_cache.get(cache_key)
+        if cached is None:
+            # AI Processing - the four LLM calls are independent, so run them concurrently
+            loop = asyncio.get_running_loop()
+            cached = await asyncio.gather(
+                loop.run_in_executor(
+                    ai_executor,
+                    ai_processor.summarize_email,
+                    email['body'],
+                    email['sender'],
+                    email['subject']
+                ),
+                loop.run_in_executor(
+                    ai_executor,
+                    ai_processor.draft_reply,
+                    email['body'],
+                    email['sender'],
+                    email['subject']
+                ),
+                loop.run_in_executor(
+                    ai_executor,
+                    ai_processor.categorize_email,
+                    email['body'],
+                    email['subject']
+                ),
+                loop.run_in_executor(ai_executor, ai_processor.extract_action_items, email['body'])
+            )
+            # ai_processor reports failures as text, so only keep fully successful runs
+            summary, drafted_reply = cached[0], cached[1]
+            if not summary.startswith("Unable to") and not drafted_reply.startswith("Unable to"):
+                _ai_results_cache[cache_key] = cached
+
+        summary, drafted_reply, ai_category, action_items = cached
 
         return {
             **email,
@@ -1,24 +1,220 @@
 import asyncio
+import hashlib
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+import random
+import re
+import time
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator, Callable, Optional, List, Dict, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-import pytz
+from sqlalchemy import and_, or_, func, literal, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from ..db.models.meeting import Meeting, MeetingTranscript, MeetingSummary
 from ..db.models.user import User
-from ..db.session import SessionLocal
-from .calendar_service import GoogleCalendarService
+from ..db.session import BackgroundSessionLocal, SessionLocal
+from .calendar_service import GoogleCalendarService, GCAL_WEBHOOK_URL
 from .transcription_service import TranscriptionService
 from .ai_processor import ai_processor
 
 logger = logging.getLogger(__name__)
 
-# Active meeting sessions {meeting_id: TranscriptionService}
-active_meetings: Dict[int, TranscriptionService] = {}
+
+def _utcnow() -> datetime:
+    # Naive UTC, matching how every DateTime column in the schema is stored
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _poll_delay(base: float, idle_cycles: int = 0) -> float:
+    # Doubles per idle cycle; the jitter keeps several app instances from polling in lockstep
+    return min(base * 2 ** idle_cycles, MAX_IDLE_BACKOFF) + random.uniform(0, 5)
+
 
 # Grace period for disconnected sessions (seconds)
 GRACE_PERIOD = 90
+INACTIVE_CHECK_INTERVAL = 30
+# Idle background loops back off up to this many seconds; capped at the grace period so an
+# orphaned session is still finalized within about twice GRACE_PERIOD
+MAX_IDLE_BACKOFF = GRACE_PERIOD
+
+# Full calendar reconciliation interval; push notifications cover changes in between
+CALENDAR_RECONCILE_INTERVAL = 600 if GCAL_WEBHOOK_URL else 60
+# Google's batch endpoint takes up to 50 sub-requests per call
+CALENDAR_BATCH_SIZE = 50
+# Concurrent batch syncs; each holds a pooled DB connection while it runs
+CALENDAR_SYNC_CONCURRENCY = 4
+
+# Transcript chunks are written in batches
+TRANSCRIPT_BATCH_SIZE = 20
+TRANSCRIPT_FLUSH_INTERVAL = 15  # seconds, well inside GRACE_PERIOD
+
+
+@dataclass
+class ActiveMeeting:
+    service: TranscriptionService
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    buffer: list = field(default_factory=list)  # pending transcript rows
+    last_flush: float = field(default_factory=time.monotonic)
+    last_activity_write: float = 0.0
+
+
+class ActiveMeetingRegistry:
+    """Live transcription sessions by meeting id; indexing returns the TranscriptionService"""
+    
+    def __init__(self):
+        self._entries: Dict[int, ActiveMeeting] = {}
+    
+    def __contains__(self, meeting_id: int) -> bool:
+        return meeting_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __getitem__(self, meeting_id: int) -> TranscriptionService:
+        return self._entries[meeting_id].service
+    
+    def register(self, meeting_id: int, service: TranscriptionService) -> ActiveMeeting:
+        entry = ActiveMeeting(service)
+        self._entries[meeting_id] = entry
+        return entry
+    
+    def entry(self, meeting_id: int) -> Optional[ActiveMeeting]:
+        return self._entries.get(meeting_id)
+    
+    def items(self) -> List[Tuple[int, ActiveMeeting]]:
+        return list(self._entries.items())
+    
+    def remove(self, meeting_id: int, entry: ActiveMeeting):
+        # Only drop the entry that was stopped, never one registered after it
+        if self._entries.get(meeting_id) is entry:
+            del self._entries[meeting_id]
+
+
+# Active meeting sessions
+active_meetings = ActiveMeetingRegistry()
+
+# Meetings whose transcription is being set up but not yet registered
+_pending_starts: set = set()
+
+# Summary jobs run in the background, a few at a time since the LLM is local
+SUMMARY_CONCURRENCY = 2
+_summary_semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+_summary_tasks: set = set()
+# A 'running' summary untouched for this long belonged to a process that died mid-job
+SUMMARY_JOB_TIMEOUT = 900
+# meeting_id -> (lock, number of holders and waiters), dropped once nobody uses it
+_summary_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
+
+@asynccontextmanager
+async def _summary_lock(meeting_id: int):
+    lock, users = _summary_locks.get(meeting_id, (None, 0))
+    lock = lock or asyncio.Lock()
+    _summary_locks[meeting_id] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _summary_locks[meeting_id]
+        if users == 1:
+            del _summary_locks[meeting_id]
+        else:
+            _summary_locks[meeting_id] = (lock, users - 1)
+
+
+# Static instructions live in the system message so only the transcript varies per call
+_SUMMARY_SYSTEM = {"role": "system", "content": (
+    "You are a professional meeting assistant that creates clear, structured meeting summaries. "
+    "Summarize the meeting you are given as a JSON object with exactly these keys:\n"
+    "\"key_points\": the main topics and important points discussed.\n"
+    "\"decisions\": any decisions that were made during the meeting.\n"
+    "\"action_items\": a list of strings, one per task or action item that was assigned, including who is responsible if mentioned.\n"
+    "\"follow_ups\": any topics that need follow-up or future discussion.\n"
+    "Use an empty string or empty list when a section has nothing."
+)}
+_CHUNK_NOTES_SYSTEM = {"role": "system", "content": (
+    "You are a professional meeting assistant. Condense the part of a meeting transcript you are given into short notes. "
+    "Keep every decision, action item (with who is responsible) and open question."
+)}
+
+# "## Heading" sections of a Markdown summary, each body running to the next heading
+_SECTION_RE = re.compile(
+    r'^##\s*(key points|decisions|action items|follow[- ]?ups)[^\n]*\n(.*?)(?=^##|\Z)',
+    re.I | re.M | re.S
+)
+_SECTION_KEYS = {
+    'key points': 'key_points',
+    'decisions': 'decisions',
+    'action items': 'action_items',
+    'follow-ups': 'follow_ups',
+    'follow ups': 'follow_ups',
+    'followups': 'follow_ups'
+}
+_BULLET_RE = re.compile(r'^[ \t]*[-*][ \t]*(.+?)[ \t]*$', re.M)
+
+# Long transcripts are summarized in parts of ~2k tokens (~4 characters per token),
+# leaving room for the prompt and reply in the local model's context window
+TRANSCRIPT_CHUNK_CHARS = 8000
+TRANSCRIPT_CHUNK_OVERLAP = 800
+# Notes per transcript part, so a retried or re-finalized meeting only pays for parts that changed
+_chunk_notes_cache: TTLCache = TTLCache(maxsize=256, ttl=24 * 3600)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Below these a transcript is silence, filler ("um, yeah, okay") or Whisper looping on noise
+MIN_SUMMARY_WORDS = 20
+MIN_UNIQUE_WORD_RATIO = 0.2
+MIN_SUMMARY_SENTENCES = 3
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+
+def _should_summarize(transcript: str) -> bool:
+    """Cheap content checks before spending an LLM call on a transcript"""
+    words = transcript.lower().split()
+    if len(words) < MIN_SUMMARY_WORDS:
+        return False
+    if len(set(words)) / len(words) < MIN_UNIQUE_WORD_RATIO:
+        return False
+    sentences = {sentence.strip() for sentence in _SENTENCE_END_RE.split(transcript.lower()) if sentence.strip()}
+    return len(sentences) >= MIN_SUMMARY_SENTENCES
+
+
+def _chunk_transcript(
+    text: str,
+    max_chars: int = TRANSCRIPT_CHUNK_CHARS,
+    overlap: int = TRANSCRIPT_CHUNK_OVERLAP
+) -> List[str]:
+    """Split a transcript on sentence boundaries into parts of at most max_chars,
+    each starting with up to overlap characters of the previous part's last sentences"""
+    if len(text) <= max_chars:
+        return [text]
+    
+    chunks, current, size = [], [], 0
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        # A run-on without punctuation is cut hard
+        for start in range(0, len(sentence), max_chars):
+            piece = sentence[start:start + max_chars]
+            if current and size + len(piece) > max_chars:
+                chunks.append(" ".join(current))
+                # Carry the tail over so a point split across parts keeps its context
+                tail, tail_size = [], 0
+                for previous in reversed(current):
+                    if tail_size + len(previous) + 1 > overlap:
+                        break
+                    tail.insert(0, previous)
+                    tail_size += len(previous) + 1
+                if tail_size + len(piece) > max_chars:
+                    tail, tail_size = [], 0
+                current, size = tail, tail_size
+            current.append(piece)
+            size += len(piece) + 1
+    
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
 
 
 class MeetingService:
@@ -38,11 +234,11 @@ class MeetingService:
             user_id=user_id,
             meet_link=meet_url,
             title=title,
-            start_time=datetime.utcnow(),
+            start_time=_utcnow(),
             calendar_event_id=calendar_event_id,
             is_manual=is_manual,
             status="active",  # Start as active immediately
-            last_activity=datetime.utcnow()
+            last_activity=_utcnow()
         )
         self.db.add(meeting)
         self.db.commit()
@@ -52,12 +248,11 @@ class MeetingService:
     
     def get_meeting(self, meeting_id: int, user_id: int) -> Optional[Meeting]:
         """Get meeting by ID"""
-        return self.db.query(Meeting).filter(
-            and_(
-                Meeting.id == meeting_id,
-                Meeting.user_id == user_id
-            )
-        ).first()
+        # Primary-key lookup goes through the identity map before it touches the database
+        meeting = self.db.get(Meeting, meeting_id)
+        if meeting and meeting.user_id == user_id:
+            return meeting
+        return None
     
     def get_active_meetings(self, user_id: int) -> List[Meeting]:
         """Get all active meetings for a user"""
@@ -70,7 +265,7 @@ class MeetingService:
     
     def get_upcoming_meetings(self, user_id: int) -> List[Meeting]:
         """Get upcoming calendar meetings within the next hour"""
-        now = datetime.utcnow()
+        now = _utcnow()
         one_hour_later = now + timedelta(hours=1)
         
         return self.db.query(Meeting).filter(
@@ -85,19 +280,98 @@ class MeetingService:
     
     def update_meeting_status(self, meeting_id: int, status: str):
         """Update meeting status"""
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if meeting:
-            meeting.status = status
-            meeting.last_activity = datetime.utcnow()
-            self.db.commit()
+        result = self.db.execute(
+            update(Meeting)
+            .where(Meeting.id == meeting_id)
+            .values(status=status, last_activity=_utcnow())
+        )
+        self.db.commit()
+        if result.rowcount:
             logger.info(f"Meeting {meeting_id} status updated to {status}")
     
     def update_last_activity(self, meeting_id: int):
         """Update last activity timestamp (for grace period tracking)"""
-        meeting = self.db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if meeting:
-            meeting.last_activity = datetime.utcnow()
-            self.db.commit()
+        # Called for every websocket message; live meetings write at most once per flush interval
+        entry = active_meetings.entry(meeting_id)
+        if entry:
+            if time.monotonic() - entry.last_activity_write < TRANSCRIPT_FLUSH_INTERVAL:
+                return
+            entry.last_activity_write = time.monotonic()
+        
+        self.db.execute(
+            update(Meeting)
+            .where(Meeting.id == meeting_id)
+            .values(last_activity=_utcnow())
+        )
+        self.db.commit()
+    
+    def sync_calendar_meetings(
+        self,
+        user: User,
+        calendar_service: Optional[GoogleCalendarService] = None,
+        first_page: Optional[Dict] = None
+    ):
+        """Mirror the user's changed Google Meet events as scheduled meetings"""
+        calendar_service = calendar_service or GoogleCalendarService(user, self.db)
+        events, sync_token = calendar_service.sync_events(user.gcal_sync_token, first_page=first_page)
+        
+        # One IN query for the whole page. Only scheduled rows are ever changed here, and
+        # inserts of events that already have a meeting are no-ops via ON CONFLICT
+        event_ids = [event['id'] for event in events]
+        existing_by_event = {}
+        if event_ids:
+            existing_by_event = {
+                meeting.calendar_event_id: meeting
+                for meeting in self.db.query(Meeting).filter(
+                    and_(
+                        Meeting.user_id == user.id,
+                        Meeting.status == "scheduled",
+                        Meeting.calendar_event_id.in_(event_ids)
+                    )
+                )
+            }
+        
+        now = _utcnow()
+        new_meetings = []
+        for event in events:
+            existing = existing_by_event.get(event['id'])
+            start = event.get('start', {}).get('dateTime')
+            
+            if event.get('status') == 'cancelled' or not event.get('hangoutLink') or not start:
+                if existing:
+                    self.db.delete(existing)
+                continue
+            
+            start_time = datetime.fromisoformat(start).astimezone(timezone.utc).replace(tzinfo=None)
+            
+            if existing:
+                existing.start_time = start_time
+                existing.title = event.get('summary', 'Untitled Meeting')
+                existing.meet_link = event['hangoutLink']
+            elif start_time >= now:
+                new_meetings.append({
+                    "user_id": user.id,
+                    "meet_link": event['hangoutLink'],
+                    "title": event.get('summary', 'Untitled Meeting'),
+                    "start_time": start_time,
+                    "calendar_event_id": event['id'],
+                    "is_manual": False,
+                    "status": "scheduled",
+                    "last_activity": now
+                })
+        
+        if new_meetings:
+            # Another worker may have synced the same events; the unique index makes this a no-op for them
+            insert = pg_insert if self.db.bind.dialect.name == "postgresql" else sqlite_insert
+            self.db.execute(
+                insert(Meeting).values(new_meetings).on_conflict_do_nothing(
+                    index_elements=['user_id', 'calendar_event_id']
+                )
+            )
+        
+        if sync_token:
+            user.gcal_sync_token = sync_token
+        self.db.commit()
     
     def save_transcript_chunk(
         self, 
@@ -106,35 +380,110 @@ class MeetingService:
         sequence_number: int,
         is_final: bool = False,
         speaker: Optional[str] = None
-    ) -> MeetingTranscript:
-        """Save a transcript chunk"""
-        transcript = MeetingTranscript(
-            meeting_id=meeting_id,
-            text=text,
-            sequence_number=sequence_number,
-            is_final=is_final,
-            speaker=speaker
-        )
-        self.db.add(transcript)
-        self.db.commit()
-        self.db.refresh(transcript)
+    ) -> Dict:
+        """Buffer a transcript chunk, writing the batch when it is full or stale"""
+        row = {
+            "meeting_id": meeting_id,
+            "text": text,
+            "sequence_number": sequence_number,
+            "is_final": is_final,
+            "speaker": speaker,
+            "timestamp": _utcnow()
+        }
+        entry = active_meetings.entry(meeting_id)
+        if entry is None:
+            self._write_transcripts(meeting_id, [row])
+            return row
         
-        # Update last activity
-        self.update_last_activity(meeting_id)
+        entry.buffer.append(row)
+        if len(entry.buffer) >= TRANSCRIPT_BATCH_SIZE or time.monotonic() - entry.last_flush >= TRANSCRIPT_FLUSH_INTERVAL:
+            self.flush_transcripts(meeting_id)
         
-        return transcript
+        return row
+    
+    def flush_transcripts(self, meeting_id: int):
+        """Write the meeting's buffered transcript chunks"""
+        entry = active_meetings.entry(meeting_id)
+        if entry is None or not entry.buffer:
+            return
+        
+        rows, entry.buffer = entry.buffer, []
+        entry.last_flush = time.monotonic()
+        self._write_transcripts(meeting_id, rows)
+    
+    def _write_transcripts(self, meeting_id: int, rows: List[Dict]):
+        """Insert transcript rows, extend the cached transcript and bump last activity in one commit"""
+        self.db.execute(MeetingTranscript.__table__.insert(), rows)
+        
+        values = {"last_activity": _utcnow()}
+        appended = "\n".join(row["text"] for row in rows if row["is_final"] and row["text"].strip())
+        if appended:
+            # Concatenated in SQL so the running transcript never round-trips through Python
+            values["cached_transcript"] = func.coalesce(Meeting.cached_transcript + "\n", "") + appended
+        
+        self.db.execute(update(Meeting).where(Meeting.id == meeting_id).values(**values))
+        self.db.commit()
+    
+    def has_final_transcript(self, meeting_id: int) -> bool:
+        """Whether the meeting has any final transcript chunk"""
+        return self.db.query(
+            self.db.query(MeetingTranscript).filter(
+                MeetingTranscript.meeting_id == meeting_id,
+                MeetingTranscript.is_final == True
+            ).exists()
+        ).scalar()
     
     def get_full_transcript(self, meeting_id: int) -> str:
-        """Get complete meeting transcript"""
-        transcripts = self.db.query(MeetingTranscript).filter(
-            MeetingTranscript.meeting_id == meeting_id
-        ).order_by(MeetingTranscript.sequence_number).all()
+        """Get complete meeting transcript, from the cached column when it is populated"""
+        cached = self.db.query(Meeting.cached_transcript).filter(Meeting.id == meeting_id).scalar()
+        if cached is not None:
+            return cached
         
-        return "\n".join([t.text for t in transcripts if t.text.strip()])
+        # Meetings recorded before the cache existed are aggregated from their chunks
+        text = MeetingTranscript.text
+        # Interim chunks are superseded by final ones and would duplicate text
+        conditions = (
+            MeetingTranscript.meeting_id == meeting_id,
+            MeetingTranscript.is_final == True,
+            func.trim(text) != ""
+        )
+        
+        if self.db.bind.dialect.name == "postgresql":
+            query = select(
+                func.string_agg(text, aggregate_order_by(literal("\n"), MeetingTranscript.sequence_number))
+            ).where(*conditions)
+        else:
+            # group_concat has no ORDER BY clause, so aggregate over an ordered subquery
+            ordered = select(text).where(*conditions).order_by(MeetingTranscript.sequence_number).subquery()
+            query = select(func.group_concat(ordered.c.text, "\n"))
+        
+        return self.db.execute(query).scalar() or ""
     
-    async def generate_summary(self, meeting_id: int, retry: bool = False) -> MeetingSummary:
-        """Generate AI summary of meeting (async, non-blocking)"""
+    async def generate_summary(
+        self,
+        meeting_id: int,
+        retry: bool = False,
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> MeetingSummary:
+        """Generate AI summary of meeting (async, non-blocking); on_delta receives the model output as it streams"""
+        # The summary worker and the retry endpoint can race; serialize them so they
+        # don't both pay for the LLM and insert duplicate MeetingSummary rows
+        async with _summary_lock(meeting_id):
+            return await self._generate_summary(meeting_id, retry, on_delta)
+    
+    async def _generate_summary(
+        self,
+        meeting_id: int,
+        retry: bool,
+        on_delta: Optional[Callable[[str], None]]
+    ) -> MeetingSummary:
+        full_transcript = None
         try:
+            # Cheap EXISTS before aggregating, for meetings that never produced a final chunk
+            if not self.has_final_transcript(meeting_id):
+                full_transcript = ""
+                raise ValueError("Transcript is too short or empty for summarization")
+            
             full_transcript = self.get_full_transcript(meeting_id)
             
             if not full_transcript or len(full_transcript.strip()) < 10:
@@ -148,25 +497,49 @@ class MeetingService:
             if existing_summary and not retry:
                 return existing_summary
             
-            # Use AI to generate structured summary (run in thread pool to avoid blocking)
-            loop = asyncio.get_event_loop()
-            summary_text = await loop.run_in_executor(
-                None, 
-                self._summarize_with_ai_sync, 
-                full_transcript
-            )
+            # An identical transcript already summarized for another meeting (duplicated
+            # calendar events, re-imported sessions) reuses that result instead of the LLM
+            transcript_hash = hashlib.sha256(full_transcript.encode()).hexdigest()
+            cached = self.db.query(MeetingSummary).filter(
+                MeetingSummary.transcript_hash == transcript_hash,
+                MeetingSummary.summary_unavailable == False,
+                MeetingSummary.meeting_id != meeting_id
+            ).first()
             
-            # Parse the summary into sections
-            parsed = self._parse_summary(summary_text)
+            summary_unavailable = False
+            if not _should_summarize(full_transcript):
+                # Silence, filler or a looping transcript; the model has nothing to work with
+                logger.info(f"skipped_summary: meeting {meeting_id} transcript too brief or repetitive")
+                parsed = {
+                    'key_points': "Meeting too brief for AI summary",
+                    'decisions': '',
+                    'action_items': [],
+                    'follow_ups': ''
+                }
+                summary_unavailable = True
+            elif cached:
+                parsed = {
+                    'key_points': cached.key_points,
+                    'decisions': cached.decisions,
+                    'action_items': cached.action_items,
+                    'follow_ups': cached.follow_ups
+                }
+            else:
+                # Use AI to generate structured summary
+                summary_text = await self._summarize_transcript(full_transcript, on_delta)
+                
+                # Parse the summary into sections
+                parsed = self._parse_summary(summary_text)
             
             # Update or create summary
             if existing_summary:
                 existing_summary.full_transcript = full_transcript
+                existing_summary.transcript_hash = transcript_hash
                 existing_summary.key_points = parsed.get('key_points')
                 existing_summary.decisions = parsed.get('decisions')
                 existing_summary.action_items = parsed.get('action_items')
                 existing_summary.follow_ups = parsed.get('follow_ups')
-                existing_summary.summary_unavailable = False
+                existing_summary.summary_unavailable = summary_unavailable
                 existing_summary.error_message = None
                 self.db.commit()
                 self.db.refresh(existing_summary)
@@ -175,11 +548,12 @@ class MeetingService:
                 summary = MeetingSummary(
                     meeting_id=meeting_id,
                     full_transcript=full_transcript,
+                    transcript_hash=transcript_hash,
                     key_points=parsed.get('key_points'),
                     decisions=parsed.get('decisions'),
                     action_items=parsed.get('action_items'),
                     follow_ups=parsed.get('follow_ups'),
-                    summary_unavailable=False
+                    summary_unavailable=summary_unavailable
                 )
                 self.db.add(summary)
                 self.db.commit()
@@ -196,7 +570,9 @@ class MeetingService:
                 MeetingSummary.meeting_id == meeting_id
             ).first()
             
-            full_transcript = self.get_full_transcript(meeting_id)
+            # Reuse the transcript already read above rather than aggregating it again
+            if full_transcript is None:
+                full_transcript = self.get_full_transcript(meeting_id)
             
             if existing_summary:
                 existing_summary.full_transcript = full_transcript
@@ -217,75 +593,137 @@ class MeetingService:
                 self.db.refresh(summary)
                 return summary
     
-    def _summarize_with_ai_sync(self, transcript: str) -> str:
-        """Synchronous wrapper for AI summarization (runs in thread pool)"""
-        prompt = f"""
-        Summarize this meeting transcript into the following sections:
-
-        ## Key Points
-        List the main topics and important points discussed.
-
-        ## Decisions
-        List any decisions that were made during the meeting.
-
-        ## Action Items
-        List specific tasks or action items that were assigned, including who is responsible if mentioned.
-
-        ## Follow-ups
-        List any topics that need follow-up or future discussion.
-
-        Meeting Transcript:
-        {transcript}
-        """
+    async def _summarize_transcript(
+        self,
+        transcript: str,
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Summarize long transcripts map-reduce style: parts in parallel, then one structured pass"""
+        chunks = _chunk_transcript(transcript)
+        if len(chunks) == 1:
+            return await self._summarize_with_ai(transcript, on_delta=on_delta)
+        
+        partials = await asyncio.gather(*[self._summarize_chunk(chunk) for chunk in chunks])
+        return await self._summarize_with_ai(
+            "\n\n".join(partials),
+            "Meeting Notes (in order, one block per part of the meeting)",
+            on_delta
+        )
+    
+    async def _summarize_chunk(self, chunk: str) -> str:
+        """Condense one part of a long transcript into notes for the final summary"""
+        cache_key = hashlib.sha256(chunk.encode()).hexdigest()
+        cached = _chunk_notes_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = await ai_processor.async_client.chat.completions.create(
+            model=ai_processor.model,
+            messages=[
+                _CHUNK_NOTES_SYSTEM,
+                {"role": "user", "content": chunk}
+            ],
+            temperature=0.3,
+            max_tokens=400
+        )
         
-        response = ai_processor.client.chat.completions.create(
+        notes = response.choices[0].message.content.strip()
+        _chunk_notes_cache[cache_key] = notes
+        return notes
+    
+    async def _summarize_with_ai(
+        self,
+        transcript: str,
+        source: str = "Meeting Transcript",
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Structured AI summary over the async client, so the event loop is never blocked"""
+        response = await ai_processor.async_client.chat.completions.create(
             model=ai_processor.model,
             messages=[
-                {"role": "system", "content": "You are a professional meeting assistant that creates clear, structured meeting summaries."},
-                {"role": "user", "content": prompt}
+                _SUMMARY_SYSTEM,
+                {"role": "user", "content": f"{source}:\n{transcript}"}
             ],
+            response_format={"type": "json_object"},
             temperature=0.5,
-            max_tokens=1000
+            max_tokens=1000,
+            stream=on_delta is not None
         )
         
-        return response.choices[0].message.content.strip()
+        if on_delta is None:
+            return response.choices[0].message.content.strip()
+        
+        parts = []
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                on_delta(chunk.choices[0].delta.content)
+        return "".join(parts).strip()
     
     def _parse_summary(self, summary_text: str) -> Dict:
-        sections = {
-            'key_points': '',
-            'decisions': '',
-            'action_items': [],
-            'follow_ups': ''
-        }
+        try:
+            data = json.loads(summary_text)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            # Servers without JSON mode answer in the Markdown headings the model defaults to;
+            # a bare JSON list, string or null isn't a summary either
+            data = {
+                _SECTION_KEYS[match.group(1).lower()]: match.group(2)
+                for match in _SECTION_RE.finditer(summary_text)
+            }
+            if not data:
+                # Recorded by generate_summary as summary_unavailable
+                raise ValueError("AI summary was neither JSON nor sectioned Markdown")
+            if 'action_items' in data:
+                data['action_items'] = _BULLET_RE.findall(data['action_items'])
+        
+        def _text(value) -> str:
+            if isinstance(value, list):
+                return "\n".join(f"- {item}" for item in value)
+            return str(value or '').strip()
+        
+        action_items = data.get('action_items') or []
+        if isinstance(action_items, str):
+            action_items = [action_items]
         
+        return {
+            'key_points': _text(data.get('key_points')),
+            'decisions': _text(data.get('decisions')),
+            'action_items': [str(item).strip() for item in action_items if str(item).strip()],
+            'follow_ups': _text(data.get('follow_ups'))
+        }
+
+
+def flush_pending_transcripts(max_age: float = TRANSCRIPT_FLUSH_INTERVAL):
+    """Write buffers that have waited max_age seconds, so a pause in speech doesn't strand them"""
+    now = time.monotonic()
+    for meeting_id, entry in active_meetings.items():
+        if not entry.buffer or now - entry.last_flush < max_age:
+            continue
+        db: Session = entry.service.db
         try:
-            parts = summary_text.split('##')
-            
-            for part in parts:
-                part = part.strip()
-                if part.lower().startswith('key points'):
-                    sections['key_points'] = part.split('\n', 1)[1].strip() if '\n' in part else ''
-                elif part.lower().startswith('decisions'):
-                    sections['decisions'] = part.split('\n', 1)[1].strip() if '\n' in part else ''
-                elif part.lower().startswith('action items'):
-                    content = part.split('\n', 1)[1] if '\n' in part else ''
-                    items = [line.strip('- ').strip() for line in content.split('\n') if line.strip().startswith('-')]
-                    sections['action_items'] = items
-                elif part.lower().startswith('follow-ups') or part.lower().startswith('follow ups'):
-                    sections['follow_ups'] = part.split('\n', 1)[1].strip() if '\n' in part else ''
+            MeetingService(db).flush_transcripts(meeting_id)
         except Exception as e:
-            logger.warning(f"Error parsing summary sections: {e}")
-        
-        return sections
+            db.rollback()
+            logger.error(f"Error flushing transcripts for meeting {meeting_id}: {e}")
 
 
 async def start_meeting_transcription(meeting_id: int):
     """Start transcription service for a meeting session"""
+    # Check-and-add has no await in between, so it is atomic on the event loop
+    if meeting_id in active_meetings or meeting_id in _pending_starts:
+        logger.info(f"Transcription for meeting {meeting_id} already running")
+        return
+    _pending_starts.add(meeting_id)
+    
+    # The session is handed to the transcription service and closed by stop_meeting_transcription
+    db: Session = SessionLocal()
+    handed_off = False
     try:
-        db: Session = SessionLocal()
         meeting_service = MeetingService(db)
         
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        meeting = db.get(Meeting, meeting_id)
         if not meeting:
             logger.error(f"Meeting {meeting_id} not found")
             return
@@ -296,7 +734,9 @@ async def start_meeting_transcription(meeting_id: int):
         
         # Create transcription service
         transcription_service = TranscriptionService(meeting_id, db)
-        active_meetings[meeting_id] = transcription_service
+        active_meetings.register(meeting_id, transcription_service)
+        _pending_starts.discard(meeting_id)
+        handed_off = True
         
         logger.info(f"Started transcription for meeting {meeting_id}")
         
@@ -306,137 +746,379 @@ async def start_meeting_transcription(meeting_id: int):
     except Exception as e:
         logger.error(f" Error starting transcription for meeting {meeting_id}: {e}")
     finally:
-        db.close()
+        _pending_starts.discard(meeting_id)
+        if not handed_off:
+            db.close()
 
 
 async def stop_meeting_transcription(meeting_id: int, force: bool = False):
     """Stop transcription and generate summary"""
     try:
-        if meeting_id in active_meetings:
-            transcription_service = active_meetings[meeting_id]
-            await transcription_service.stop()
-            del active_meetings[meeting_id]
-            
+        entry = active_meetings.entry(meeting_id)
+        if entry:
+            async with entry.lock:
+                # A concurrent stop already finalized this meeting
+                if active_meetings.entry(meeting_id) is not entry:
+                    return
+                
+                await entry.service.stop()
+                # Reuse the session the meeting was transcribed with
+                db: Session = entry.service.db
+                MeetingService(db).flush_transcripts(meeting_id)
+                active_meetings.remove(meeting_id, entry)
             logger.info(f"Stopped transcription for meeting {meeting_id}")
+        else:
+            db: Session = SessionLocal()
         
-        # Update status to finalizing
-        db: Session = SessionLocal()
-        meeting_service = MeetingService(db)
-        meeting_service.update_meeting_status(meeting_id, "finalizing")
-        
-        # Generate summary in background
         try:
-            summary = await meeting_service.generate_summary(meeting_id)
-            meeting_service.update_meeting_status(meeting_id, "completed")
-            logger.info(f"Generated summary for meeting {meeting_id}")
-        except Exception as summary_error:
-            logger.error(f"Summary generation failed for meeting {meeting_id}: {summary_error}")
-            meeting_service.update_meeting_status(meeting_id, "completed")
-        
-        # Set end time
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if meeting:
-            meeting.end_time = datetime.utcnow()
+            # Mark finalizing and hand the summary to the background queue; the status
+            # guard makes a second stop (inactivity checker vs. user) a no-op
+            now = _utcnow()
+            finalized = db.execute(
+                update(Meeting)
+                .where(Meeting.id == meeting_id, Meeting.status.notin_(("finalizing", "completed")))
+                .values(status="finalizing", summary_status="queued", end_time=now, last_activity=now)
+                .returning(Meeting.id)
+            ).first()
             db.commit()
-        
-        db.close()
+            if finalized:
+                enqueue_summary(meeting_id)
+        finally:
+            db.close()
             
     except Exception as e:
         logger.error(f"❌Error stopping meeting {meeting_id}: {e}")
 
 
+def enqueue_summary(meeting_id: int):
+    """Queue summary generation so stopping a meeting returns without waiting on the LLM"""
+    task = asyncio.create_task(_run_summary_job(meeting_id))
+    # Keep a reference so the task isn't garbage collected mid-run
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+
+
+async def resume_summary_jobs():
+    """Re-enqueue summaries a previous process queued or abandoned mid-run"""
+    def _recover() -> List[int]:
+        db: Session = BackgroundSessionLocal()
+        try:
+            db.execute(
+                update(Meeting)
+                .where(
+                    Meeting.summary_status == "running",
+                    Meeting.updated_at < _utcnow() - timedelta(seconds=SUMMARY_JOB_TIMEOUT)
+                )
+                .values(summary_status="queued")
+            )
+            queued_ids = db.execute(
+                select(Meeting.id).where(Meeting.summary_status == "queued")
+            ).scalars().all()
+            db.commit()
+            return queued_ids
+        finally:
+            db.close()
+    
+    queued_ids = await asyncio.to_thread(_recover)
+    for meeting_id in queued_ids:
+        enqueue_summary(meeting_id)
+    if queued_ids:
+        logger.info(f"Resumed {len(queued_ids)} queued meeting summaries")
+
+
+async def stream_meeting_summary(meeting_id: int) -> AsyncGenerator[str, None]:
+    """
+    Yield the summary JSON as the model writes it. The summary is stored exactly as
+    generate_summary stores it, and generation finishes even if the client disconnects
+    """
+    deltas: asyncio.Queue = asyncio.Queue()
+    
+    async def _generate() -> Dict:
+        # Own session: the request's session is closed once the response starts streaming.
+        # Never raises, so the result is there even after the client has gone
+        db: Session = SessionLocal()
+        try:
+            try:
+                summary = await MeetingService(db).generate_summary(meeting_id, on_delta=deltas.put_nowait)
+                result = {
+                    'key_points': summary.key_points,
+                    'decisions': summary.decisions,
+                    'action_items': summary.action_items,
+                    'follow_ups': summary.follow_ups,
+                    'summary_unavailable': summary.summary_unavailable,
+                    'error_message': summary.error_message
+                }
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Streamed summary failed for meeting {meeting_id}: {e}")
+                result = {'summary_unavailable': True, 'error_message': str(e)}
+            
+            # Settle the row like _run_summary_job, so a queued job for it isn't run again
+            try:
+                db.execute(
+                    update(Meeting)
+                    .where(Meeting.id == meeting_id)
+                    .values(
+                        summary_status="failed" if result['summary_unavailable'] else "done",
+                        status="completed",
+                        last_activity=_utcnow()
+                    )
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error updating summary status for meeting {meeting_id}: {e}")
+            return result
+        finally:
+            db.close()
+    
+    job = asyncio.create_task(_generate())
+    _summary_tasks.add(job)
+    job.add_done_callback(_summary_tasks.discard)
+    job.add_done_callback(lambda _: deltas.put_nowait(None))
+    
+    streamed = False
+    while (delta := await deltas.get()) is not None:
+        streamed = True
+        yield delta
+    
+    result = await job
+    if not streamed:
+        # Stored, cached or skipped summaries never reach the model, so send the saved result
+        yield json.dumps(result)
+    elif result['summary_unavailable']:
+        # The streamed JSON is incomplete or was not stored; close with the failure on its own line
+        yield "\n" + json.dumps(result)
+
+
+async def _run_summary_job(meeting_id: int):
+    async with _summary_semaphore:
+        db: Session = BackgroundSessionLocal()
+        try:
+            # Claim the job on the row so another worker process can't run it too
+            claimed = db.execute(
+                update(Meeting)
+                .where(Meeting.id == meeting_id, Meeting.summary_status == "queued")
+                .values(summary_status="running")
+                .returning(Meeting.id)
+            ).first()
+            db.commit()
+            if not claimed:
+                return
+            
+            summary = await MeetingService(db).generate_summary(meeting_id)
+            
+            db.execute(
+                update(Meeting)
+                .where(Meeting.id == meeting_id)
+                .values(
+                    summary_status="failed" if summary.summary_unavailable else "done",
+                    status="completed",
+                    last_activity=_utcnow()
+                )
+            )
+            db.commit()
+            logger.info(f"Generated summary for meeting {meeting_id}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Summary generation failed for meeting {meeting_id}: {e}")
+            db.query(Meeting).filter(Meeting.id == meeting_id).update(
+                {"summary_status": "failed", "status": "completed"}
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
 async def check_inactive_sessions():
     """Background task to check for inactive sessions and auto-finalize after grace period"""
+    idle_cycles = 0
     while True:
+        db: Session = BackgroundSessionLocal()
         try:
-            db: Session = SessionLocal()
-            
-            # Find active meetings that haven't had activity in GRACE_PERIOD
-            cutoff_time = datetime.utcnow() - timedelta(seconds=GRACE_PERIOD)
+            # Find active meetings that haven't had activity in GRACE_PERIOD (ids only)
+            cutoff_time = _utcnow() - timedelta(seconds=GRACE_PERIOD)
             
-            inactive_meetings = db.query(Meeting).filter(
-                and_(
+            inactive_ids = db.execute(
+                select(Meeting.id).where(
                     Meeting.status == "active",
                     Meeting.last_activity < cutoff_time
                 )
-            ).all()
+            ).scalars().all()
             
-            for meeting in inactive_meetings:
-                logger.warning(f"Meeting {meeting.id} inactive for {GRACE_PERIOD}s, auto-finalizing...")
-                asyncio.create_task(stop_meeting_transcription(meeting.id, force=True))
+            for meeting_id in inactive_ids:
+                logger.warning(f"Meeting {meeting_id} inactive for {GRACE_PERIOD}s, auto-finalizing...")
+                asyncio.create_task(stop_meeting_transcription(meeting_id, force=True))
             
-            db.close()
+            # With nothing transcribing here, only sessions orphaned by another
+            # process can go stale, so the check backs off until there's work again
+            if inactive_ids or len(active_meetings):
+                idle_cycles = 0
+            else:
+                idle_cycles += 1
             
         except Exception as e:
             logger.error(f"Error in inactive session checker: {e}")
+        finally:
+            db.close()
         
-        # Check every 30 seconds
-        await asyncio.sleep(30)
+        await asyncio.sleep(_poll_delay(INACTIVE_CHECK_INTERVAL, idle_cycles))
+
+
+def sync_user_calendars(user_ids: List[int], renew_watch: bool = False):
+    """Pull calendar changes for a group of users, fetching their first pages in one batch request"""
+    db: Session = BackgroundSessionLocal()
+    try:
+        users = db.query(User).filter(User.id.in_(user_ids)).all()
+        
+        calendars = {}
+        for user in users:
+            try:
+                calendars[user.id] = GoogleCalendarService(user, db)
+            except Exception as e:
+                logger.error(f"Error syncing calendar for user {user.id}: {e}")
+        
+        first_pages = {}
+        if len(calendars) > 1:
+            first_pages = _batch_first_pages(users, calendars)
+        
+        for user in users:
+            calendar_service = calendars.get(user.id)
+            if not calendar_service:
+                continue
+            try:
+                MeetingService(db).sync_calendar_meetings(user, calendar_service, first_pages.get(user.id))
+                if renew_watch:
+                    calendar_service.ensure_watch()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error syncing calendar for user {user.id}: {e}")
+    finally:
+        db.close()
+
+
+def _batch_first_pages(users: List[User], calendars: Dict[int, GoogleCalendarService]) -> Dict[int, Dict]:
+    """One HTTPS round trip for every user's first sync page; each sub-request carries its user's credentials"""
+    first_pages = {}
+    
+    def _on_page(request_id, response, exception):
+        # Failed sub-requests (e.g. 410 for an expired sync token) are retried per user by sync_events
+        if exception is None:
+            first_pages[int(request_id)] = response
+    
+    batch = None
+    for user in users:
+        calendar_service = calendars.get(user.id)
+        if not calendar_service:
+            continue
+        if batch is None:
+            batch = calendar_service.service.new_batch_http_request(callback=_on_page)
+        batch.add(calendar_service.sync_events_request(user.gcal_sync_token), request_id=str(user.id))
+    
+    try:
+        batch.execute()
+    except Exception as e:
+        logger.warning(f"Batch calendar fetch failed, syncing users individually: {e}")
+    return first_pages
+
+
+def sync_user_calendar(user_id: int):
+    """Pull calendar changes for one user (run after a push notification)"""
+    sync_user_calendars([user_id])
+
+
+async def _reconcile_calendars(user_ids: List[int]):
+    """Sync every user's calendar in batches of CALENDAR_BATCH_SIZE, a few batches at a time"""
+    semaphore = asyncio.Semaphore(CALENDAR_SYNC_CONCURRENCY)
+    
+    async def _sync(group: List[int]):
+        async with semaphore:
+            await asyncio.to_thread(sync_user_calendars, group, True)
+    
+    # One failed group must not cancel the others or stall the due-meeting claim
+    results = await asyncio.gather(*(
+        _sync(user_ids[start:start + CALENDAR_BATCH_SIZE])
+        for start in range(0, len(user_ids), CALENDAR_BATCH_SIZE)
+    ), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Error syncing calendar batch: {result}")
+
+
+def _users_to_reconcile(db: Session) -> List[int]:
+    query = db.query(User.id).filter(
+        and_(
+            User.google_access_token.isnot(None),
+            User.is_active == True
+        )
+    )
+    if GCAL_WEBHOOK_URL:
+        # Users with a live watch channel are kept current by push notifications
+        query = query.filter(or_(
+            User.gcal_channel_id.is_(None),
+            User.gcal_channel_expiration.is_(None),
+            User.gcal_channel_expiration <= _utcnow() + timedelta(days=1)
+        ))
+    user_ids = [user_id for (user_id,) in query]
+    # Release the connection while the per-user syncs run on their own sessions
+    db.commit()
+    return user_ids
+
+
+def _claim_due_meetings(db: Session) -> List[int]:
+    now = _utcnow()
+    one_minute_later = now + timedelta(minutes=1)
+    
+    # Claim due meetings in one statement; SKIP LOCKED lets several workers poll without double-starting
+    due_meetings = select(Meeting.id).where(
+        and_(
+            Meeting.status == "scheduled",
+            Meeting.is_manual == False,
+            Meeting.start_time >= now - timedelta(minutes=5),
+            Meeting.start_time <= one_minute_later
+        )
+    ).with_for_update(skip_locked=True).scalar_subquery()
+    
+    claimed_ids = db.execute(
+        update(Meeting)
+        .where(Meeting.id.in_(due_meetings))
+        .values(status="active", last_activity=now)
+        .returning(Meeting.id)
+    ).scalars().all()
+    db.commit()
+    db.expire_all()
+    return claimed_ids
 
 
 async def poll_calendar_for_meetings():
-    # Background task to poll Google Calendar for upcoming meetings
+    # Background task that reconciles calendars and starts scheduled meetings as they come due
     logger.info("Starting calendar polling service...")
     
+    # One session for the lifetime of the poller, expired between ticks so reads stay fresh
+    db: Session = BackgroundSessionLocal()
+    last_reconcile = None
+    
     while True:
         try:
-            db: Session = SessionLocal()
-            
-            users = db.query(User).filter(
-                and_(
-                    User.google_access_token.isnot(None),
-                    User.is_active == True
-                )
-            ).all()
+            # Queries run on a worker thread so a slow database never stalls request handling
+            # Full reconciliation is only a fallback for missed push notifications
+            if last_reconcile is None or time.monotonic() - last_reconcile >= CALENDAR_RECONCILE_INTERVAL:
+                user_ids = await asyncio.to_thread(_users_to_reconcile, db)
+                await _reconcile_calendars(user_ids)
+                
+                last_reconcile = time.monotonic()
             
-            now = datetime.utcnow()
-            one_minute_later = now + timedelta(minutes=1)
+            flush_pending_transcripts()
             
-            for user in users:
-                try:
-                    calendar_service = GoogleCalendarService(user, db)
-                    meeting_service = MeetingService(db)
-                    
-                    upcoming_events = calendar_service.get_upcoming_events(time_min=now, time_max=one_minute_later)
-                    
-                    for event in upcoming_events:
-                        meet_link = event.get('hangoutLink')
-                        if not meet_link:
-                            continue
-                        
-                        event_id = event['id']
-                        
-                        existing = db.query(Meeting).filter(
-                            and_(
-                                Meeting.user_id == user.id,
-                                Meeting.calendar_event_id == event_id
-                            )
-                        ).first()
-                        
-                        if existing and existing.status == "active":
-                            continue
-                        
-                        if not existing:
-                            start_time = datetime.fromisoformat(event['start'].get('dateTime', event['start'].get('date')).replace('Z', '+00:00'))
-                            
-                            meeting = meeting_service.create_meeting_session(
-                                user_id=user.id,
-                                meet_url=meet_link,
-                                title=event.get('summary', 'Untitled Meeting'),
-                                calendar_event_id=event_id,
-                                is_manual=False
-                            )
-                            
-                            asyncio.create_task(start_meeting_transcription(meeting.id))
-                            logger.info(f"Auto-started meeting {meeting.id} from calendar")
-                
-                except Exception as user_error:
-                    logger.error(f"Error processing calendar for user {user.id}: {user_error}")
-                    continue
+            claimed_ids = await asyncio.to_thread(_claim_due_meetings, db)
             
-            db.close()
+            for meeting_id in claimed_ids:
+                asyncio.create_task(start_meeting_transcription(meeting_id))
+                logger.info(f"Auto-started meeting {meeting_id} from calendar")
             
         except Exception as e:
+            db.rollback()
             logger.error(f"Error in calendar polling service: {e}")
         
-        await asyncio.sleep(60)
\ No newline at end of file
+        # No idle backoff: meetings added by push notifications must still start on time
+        await asyncio.sleep(_poll_delay(60))
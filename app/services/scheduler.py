@@ -1,14 +1,16 @@
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta
 from ..db.models.task import Task
 from ..db.models.user import User
-from ..db.session import SessionLocal
-from ..utils.notifications import send_task_reminder_email
+from ..db.session import BackgroundSessionLocal
+from ..utils.notifications import send_task_reminder_email, send_task_reminder_email_async
 from ..utils.logger import get_logger
 from .summary_service import generate_all_daily_summaries
+import asyncio
 import logging
 
 logger = get_logger(__name__)
@@ -16,56 +18,96 @@ logger = get_logger(__name__)
 # Reduce APScheduler logging noise
 logging.getLogger('apscheduler').setLevel(logging.WARNING)
 
-scheduler = BackgroundScheduler()
+# Failed reminders are retried by the reconciliation job until they are this late
+REMINDER_RETRY_WINDOW = timedelta(hours=24)
 
+# Runs on the FastAPI event loop, so it must be started from the startup hook
+scheduler = AsyncIOScheduler()
 
-def check_due_tasks():
+
+async def check_due_tasks():
     """
-    Background job that runs every minute to check for tasks
-    where
+    Reconciliation job for reminders whose DateTrigger job never fired
+    (created before a restart, or due while the app was down)
     """
-    db: Session = SessionLocal()
+    db: Session = BackgroundSessionLocal()
     try:
-        now = datetime.utcnow()
-        
-        # Find tasks that are due and haven't been notified
-        due_tasks = db.query(Task).filter(
-            Task.due_date <= now,
-            Task.is_notified == False,
-            Task.is_completed == False
-        ).all()
-        
-        for task in due_tasks:
-            try:
-                # Get user for email
-                user = db.query(User).filter(User.id == task.user_id).first()
-                if user and user.email:
-                    # Send notification
-                    send_task_reminder_email(
-                        to_email=user.email,
-                        task_title=task.title,
-                        task_description=task.description,
-                        due_date=task.due_date
-                    )
-                    logger.info(f"Sent reminder for task {task.id} to {user.email}")
-                
-                # Mark as notified
-                task.is_notified = True
-                db.commit()
-                
-            except Exception as e:
-                logger.error(f"Error sending reminder for task {task.id}: {e}")
-                db.rollback()
-        
-        if due_tasks:
-            logger.info(f"Processed {len(due_tasks)} due task reminders")
-            
+        claimed, users = await asyncio.to_thread(_claim_due_tasks, db)
+        if not claimed:
+            return
+
+        sendable = [row for row in claimed if row.user_id in users]
+
+        # Each send does its own Gmail round trip, so fan them out
+        results = await asyncio.gather(*(
+            send_task_reminder_email_async(
+                user=users[row.user_id],
+                db=db,
+                task_title=row.title,
+                task_description=row.description,
+                due_date=row.due_date
+            )
+            for row in sendable
+        ), return_exceptions=True)
+
+        failed_ids = [row.id for row, sent in zip(sendable, results) if sent is not True]
+        # Gmail disconnected between the claim and the user lookup
+        failed_ids += [row.id for row in claimed if row.user_id not in users]
+        if failed_ids:
+            # Release failed claims so the next run retries them
+            await asyncio.to_thread(_release_tasks, failed_ids)
+
+        logger.info(f"Processed {len(claimed)} due task reminders ({len(failed_ids)} failed)")
+
     except Exception as e:
         logger.error(f"Error in check_due_tasks: {e}")
     finally:
         db.close()
 
 
+def _claim_due_tasks(db: Session):
+    # Marking and selecting in one UPDATE means a task is only ever sent by one job
+    rows = db.execute(
+        update(Task)
+        .where(
+            Task.due_date <= datetime.utcnow(),
+            Task.is_notified == False,
+            Task.is_completed == False,
+            # Reminders go out through the user's Gmail; without it there is nothing to retry
+            Task.user_id.in_(select(User.id).where(User.google_access_token.isnot(None)))
+        )
+        .values(is_notified=True)
+        .returning(Task.id, Task.title, Task.description, Task.due_date, Task.user_id)
+    ).all()
+    db.commit()
+    if not rows:
+        return rows, {}
+
+    # One lookup for every recipient instead of one per reminder
+    users = db.query(User).filter(
+        User.id.in_({row.user_id for row in rows}),
+        User.google_access_token.isnot(None)
+    ).all()
+    return rows, {user.id: user for user in users}
+
+
+def _release_tasks(task_ids):
+    """Unclaim failed reminders for another attempt, giving up once they are too late to matter"""
+    db: Session = BackgroundSessionLocal()
+    try:
+        released = db.execute(
+            update(Task)
+            .where(Task.id.in_(task_ids), Task.due_date >= datetime.utcnow() - REMINDER_RETRY_WINDOW)
+            .values(is_notified=False)
+            .returning(Task.id)
+        ).scalars().all()
+        db.commit()
+        if len(released) < len(task_ids):
+            logger.warning(f"Gave up on {len(task_ids) - len(released)} task reminders past the retry window")
+    finally:
+        db.close()
+
+
 def schedule_task_reminder(task_id: int, due_date: datetime, user_email: str):
     try:
         job_id = f"task_reminder_{task_id}"
@@ -88,19 +130,36 @@ def schedule_task_reminder(task_id: int, due_date: datetime, user_email: str):
 
 
 def send_reminder(task_id: int, user_email: str):
-    db: Session = SessionLocal()
+    db: Session = BackgroundSessionLocal()
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task and not task.is_completed and not task.is_notified:
-            send_task_reminder_email(
-                to_email=user_email,
-                task_title=task.title,
-                task_description=task.description,
-                due_date=task.due_date
-            )
-            task.is_notified = True
-            db.commit()
+        # Claim the task first so the reconciliation job can't send it as well
+        task = db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.is_notified == False, Task.is_completed == False)
+            .values(is_notified=True)
+            .returning(Task.title, Task.description, Task.due_date)
+        ).first()
+        db.commit()
+        if not task:
+            return
+
+        user = db.query(User).filter(User.email == user_email).first()
+        if not user:
+            logger.error(f"User with email {user_email} not found")
+            _release_tasks([task_id])
+            return
+
+        sent = send_task_reminder_email(
+            user=user,
+            db=db,
+            task_title=task.title,
+            task_description=task.description,
+            due_date=task.due_date
+        )
+        if sent:
             logger.info(f"Sent scheduled reminder for task {task_id}")
+        else:
+            _release_tasks([task_id])
     except Exception as e:
         logger.error(f"Error in send_reminder for task {task_id}: {e}")
     finally:
@@ -108,16 +167,20 @@ def send_reminder(task_id: int, user_email: str):
 
 
 def start_scheduler():
+    # A second start would register every job again and double each reminder
+    if scheduler.running:
+        logger.warning("Task scheduler already running, not starting it again")
+        return
     try:
-        # Check due tasks every minute
+        # Reminders fire from their own DateTrigger jobs, this only catches missed ones
         scheduler.add_job(
             func=check_due_tasks,
             trigger='interval',
-            minutes=1,
+            minutes=10,
             id='check_due_tasks',
             replace_existing=True
         )
-        logger.info("Scheduled: Check due tasks (every minute)")
+        logger.info("Scheduled: Reconcile due tasks (every 10 minutes)")
         
         # Job 2: Generate daily summaries at midnight UTC (1 AM WAT)
         scheduler.add_job(
@@ -138,6 +201,9 @@ def start_scheduler():
 
 def shutdown_scheduler():
     try:
+        # Safe to call twice, e.g. when startup failed before the scheduler came up
+        if not scheduler.running:
+            return
         scheduler.shutdown()
         logger.info("Task scheduler shutdown successfully")
     except Exception as e:
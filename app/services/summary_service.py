@@ -1,21 +1,84 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from datetime import datetime, date, timedelta
-import pytz
-from typing import Dict, List
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Optional
+from cachetools import TLRUCache
 from ..db.models.summary import DailySummary
 from ..db.models.task import Task
 from ..db.models.calendar import CalendarEvent
 from ..db.models.email_manage import EmailSummary
 from ..db.models.user import User
-from ..db.session import SessionLocal
+from ..schemas.summary import DailySummaryResponse
+from ..db.session import BackgroundSessionLocal
+from ..utils.helpers import fast_count
 from ..utils.logger import get_logger
 from ..utils.notifications import send_daily_task_summary
 from .email_service import GmailService
 
 logger = get_logger(__name__)
 
-WAT = pytz.timezone('Africa/Lagos')
+WAT = ZoneInfo('Africa/Lagos')
+UTC = timezone.utc
+
+
+def _summary_cache_expiry(key: tuple, value, now: float) -> float:
+    # A day's summary only changes through the writes that invalidate it, so keep it
+    # until the WAT day is over (plus a little grace for the nightly job)
+    _, target_date = key
+    day_end = datetime.combine(target_date + timedelta(days=1), time.min, tzinfo=WAT)
+    return now + max((day_end - datetime.now(WAT)).total_seconds(), 0) + 300
+
+
+# (completed tasks, meetings) thresholds, checked in order; the last one always matches
+_ENCOURAGEMENTS = (
+    (5, 3, " Excellent work! 🎉"),
+    (3, 2, " Great job! 👏"),
+    (0, 0, " Keep it up! 💪")
+)
+
+
+def _plural(count: int, noun: str) -> str:
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+# Counters a DailySummary is computed from; summary_text only depends on these
+_STAT_FIELDS = (
+    'total_tasks',
+    'completed_tasks',
+    'pending_tasks',
+    'overdue_tasks',
+    'meetings_count',
+    'emails_processed',
+    'emails_sent'
+)
+
+# Concurrent Gmail sends in the nightly job
+SUMMARY_EMAIL_WORKERS = 16
+# Users loaded, upserted and emailed together by the nightly job
+SUMMARY_USER_BATCH = 500
+
+# (user_id, summary_date) -> DailySummaryResponse
+_summary_cache: TLRUCache = TLRUCache(maxsize=2048, ttu=_summary_cache_expiry)
+
+
+def _task_stat_columns(day_start: datetime, day_end: datetime, now: datetime) -> tuple:
+    """Total, completed, pending and overdue task counts as conditional aggregates"""
+    return (
+        func.count(case((Task.created_at <= day_end, 1))).label('total_tasks'),
+        func.count(case((
+            and_(Task.is_completed == True, Task.updated_at >= day_start, Task.updated_at <= day_end), 1
+        ))).label('completed_tasks'),
+        # Not total - completed: completed only counts tasks finished during the day
+        func.count(case((Task.is_completed == False, 1))).label('pending_tasks'),
+        func.count(case((
+            and_(Task.is_completed == False, Task.due_date < now, Task.due_date.isnot(None)), 1
+        ))).label('overdue_tasks')
+    )
 
 
 class SummaryService:
@@ -30,13 +93,13 @@ class SummaryService:
             target_date = self.get_wat_date()
         
         # Start of day in WAT
-        start = WAT.localize(datetime.combine(target_date, datetime.min.time()))
+        start = datetime.combine(target_date, time.min, tzinfo=WAT)
         # End of day in WAT
-        end = WAT.localize(datetime.combine(target_date, datetime.max.time()))
+        end = datetime.combine(target_date, time.max, tzinfo=WAT)
         
         # Convert to UTC for database queries
-        start_utc = start.astimezone(pytz.UTC)
-        end_utc = end.astimezone(pytz.UTC)
+        start_utc = start.astimezone(UTC)
+        end_utc = end.astimezone(UTC)
         
         return start_utc, end_utc
     
@@ -47,54 +110,29 @@ class SummaryService:
             
             day_start, day_end = self.get_wat_day_range(target_date)
             
-            # Task statistics
-            total_tasks = self.db.query(Task).filter(
-                Task.user_id == user.id,
-                Task.created_at <= day_end
-            ).count()
-            
-            completed_tasks = self.db.query(Task).filter(
-                and_(
-                    Task.user_id == user.id,
-                    Task.is_completed == True,
-                    Task.updated_at >= day_start,
-                    Task.updated_at <= day_end
-                )
-            ).count()
-            
-            pending_tasks = self.db.query(Task).filter(
-                and_(
-                    Task.user_id == user.id,
-                    Task.is_completed == False
-                )
-            ).count()
-            
-            overdue_tasks = self.db.query(Task).filter(
-                and_(
-                    Task.user_id == user.id,
-                    Task.is_completed == False,
-                    Task.due_date < datetime.now(pytz.UTC),
-                    Task.due_date.isnot(None)
-                )
-            ).count()
+            # Task statistics - every task counter in a single pass over the user's tasks
+            total_tasks, completed_tasks, pending_tasks, overdue_tasks = self.db.execute(
+                select(*_task_stat_columns(day_start, day_end, datetime.now(UTC)))
+                .where(Task.user_id == user.id)
+            ).one()
             
             # Calendar statistics - meetings that occurred today
-            meetings_count = self.db.query(CalendarEvent).filter(
-                and_(
-                    CalendarEvent.user_id == user.id,
-                    CalendarEvent.start_time >= day_start,
-                    CalendarEvent.start_time <= day_end
-                )
-            ).count()
+            meetings_count = fast_count(
+                self.db,
+                CalendarEvent,
+                CalendarEvent.user_id == user.id,
+                CalendarEvent.start_time >= day_start,
+                CalendarEvent.start_time <= day_end
+            )
             
             # Email statistics - emails processed today
-            emails_processed = self.db.query(EmailSummary).filter(
-                and_(
-                    EmailSummary.user_id == user.id,
-                    EmailSummary.created_at >= day_start,
-                    EmailSummary.created_at <= day_end
-                )
-            ).count()
+            emails_processed = fast_count(
+                self.db,
+                EmailSummary,
+                EmailSummary.user_id == user.id,
+                EmailSummary.created_at >= day_start,
+                EmailSummary.created_at <= day_end
+            )
             
             # TODO:
             # Emails sent (would need tracking in your email service)
@@ -117,6 +155,60 @@ class SummaryService:
             logger.error(f"Error collecting stats for user {user.id}: {e}")
             raise
     
+    def collect_all_users_daily_stats(self, target_date: date = None) -> Dict[int, Dict]:
+        """collect_user_daily_stats for every user at once, with one GROUP BY query per table"""
+        try:
+            if not target_date:
+                target_date = self.get_wat_date()
+            
+            day_start, day_end = self.get_wat_day_range(target_date)
+            
+            stats_by_user = defaultdict(lambda: {
+                'target_date': target_date,
+                'total_tasks': 0,
+                'completed_tasks': 0,
+                'pending_tasks': 0,
+                'overdue_tasks': 0,
+                'meetings_count': 0,
+                'emails_processed': 0,
+                'emails_sent': 0
+            })
+            
+            task_rows = self.db.execute(
+                select(Task.user_id, *_task_stat_columns(day_start, day_end, datetime.now(UTC)))
+                .group_by(Task.user_id)
+            )
+            for user_id, total, completed, pending, overdue in task_rows:
+                stats_by_user[user_id].update({
+                    'total_tasks': total,
+                    'completed_tasks': completed,
+                    'pending_tasks': pending,
+                    'overdue_tasks': overdue
+                })
+            
+            meeting_rows = self.db.execute(
+                select(CalendarEvent.user_id, func.count())
+                .where(CalendarEvent.start_time >= day_start, CalendarEvent.start_time <= day_end)
+                .group_by(CalendarEvent.user_id)
+            )
+            for user_id, count in meeting_rows:
+                stats_by_user[user_id]['meetings_count'] = count
+            
+            email_rows = self.db.execute(
+                select(EmailSummary.user_id, func.count())
+                .where(EmailSummary.created_at >= day_start, EmailSummary.created_at <= day_end)
+                .group_by(EmailSummary.user_id)
+            )
+            for user_id, count in email_rows:
+                stats_by_user[user_id]['emails_processed'] = count
+            
+            # Users with no activity at all get zeroed stats on lookup
+            return stats_by_user
+            
+        except Exception as e:
+            logger.error(f"Error collecting stats for all users: {e}")
+            raise
+    
     def generate_summary_text(self, stats: Dict) -> str:
         try:
             completed = stats['completed_tasks']
@@ -125,46 +217,35 @@ class SummaryService:
             emails = stats['emails_processed']
             overdue = stats['overdue_tasks']
             
-            # Build dynamic summary
-            parts = []
-            
             # Task summary
+            parts = []
             if completed > 0:
-                if total > 0:
-                    parts.append(f"You completed {completed} out of {total} tasks")
-                else:
-                    parts.append(f"You completed {completed} task{'s' if completed != 1 else ''}")
+                parts.append(f"You completed {completed} out of {total} tasks" if total > 0 else f"You completed {_plural(completed, 'task')}")
             elif total > 0:
-                parts.append(f"You have {total} task{'s' if total != 1 else ''} in your list")
+                parts.append(f"You have {_plural(total, 'task')} in your list")
             
-            # Meeting summary
+            # Meeting and email summary
             if meetings > 0:
-                parts.append(f"attended {meetings} meeting{'s' if meetings != 1 else ''}")
-            
-            # Email summary
+                parts.append(f"attended {_plural(meetings, 'meeting')}")
             if emails > 0:
-                parts.append(f"processed {emails} email{'s' if emails != 1 else ''}")
+                parts.append(f"processed {_plural(emails, 'email')}")
             
-            # Build final message
-            if parts:
+            if not parts:
+                summary = "No activity recorded today. Time to get productive!"
+            else:
                 summary = ", ".join(parts) + " today"
-                # Capitalize first letter
                 summary = summary[0].upper() + summary[1:] + "."
-            else:
-                summary = "No activity recorded today. Time to get productive!"
-            
-            # Add encouragement
-            if completed > 0 or meetings > 0 or emails > 0:
-                if completed >= 5 or meetings >= 3:
-                    summary += " Excellent work! 🎉"
-                elif completed >= 3 or meetings >= 2:
-                    summary += " Great job! 👏"
-                else:
-                    summary += " Keep it up! 💪"
+                
+                # Add encouragement
+                if completed > 0 or meetings > 0 or emails > 0:
+                    summary += next(
+                        message for min_completed, min_meetings, message in _ENCOURAGEMENTS
+                        if completed >= min_completed or meetings >= min_meetings
+                    )
             
             # Add warning for overdue tasks
             if overdue > 0:
-                summary += f" Note: You have {overdue} overdue task{'s' if overdue != 1 else ''}. ⚠️"
+                summary += f" Note: You have {_plural(overdue, 'overdue task')}. ⚠️"
             
             return summary
             
@@ -172,16 +253,14 @@ class SummaryService:
             logger.error(f"Error generating summary text: {e}")
             return "Summary generation failed."
     
-    def create_or_update_daily_summary(self, user: User, target_date: date = None) -> DailySummary:
+    def create_or_update_daily_summary(self, user: User, target_date: date = None, stats: Dict = None) -> DailySummary:
         try:
             if not target_date:
                 target_date = self.get_wat_date()
             
-            # Collect stats
-            stats = self.collect_user_daily_stats(user, target_date)
-            
-            # Generate summary text
-            summary_text = self.generate_summary_text(stats)
+            # Collect stats, unless the caller already has them from the batch query
+            if stats is None:
+                stats = self.collect_user_daily_stats(user, target_date)
             
             # Check if summary already exists for this date
             existing_summary = self.db.query(DailySummary).filter(
@@ -191,6 +270,14 @@ class SummaryService:
                 )
             ).first()
             
+            # The text is derived from the counters, so unchanged counters mean nothing to write
+            if existing_summary and all(getattr(existing_summary, field) == stats[field] for field in _STAT_FIELDS):
+                logger.info(f"Daily summary for user {user.id} on {target_date} unchanged")
+                return existing_summary
+            
+            # Generate summary text
+            summary_text = self.generate_summary_text(stats)
+            
             if existing_summary:
                 # Update existing summary
                 existing_summary.total_tasks = stats['total_tasks']
@@ -205,6 +292,7 @@ class SummaryService:
                 
                 self.db.commit()
                 self.db.refresh(existing_summary)
+                _summary_cache.pop((user.id, target_date), None)
                 
                 logger.info(f"Updated daily summary for user {user.id} on {target_date}")
                 return existing_summary
@@ -235,11 +323,46 @@ class SummaryService:
             logger.error(f"Error creating/updating summary for user {user.id}: {e}")
             raise
     
-    def get_user_summary(self, user: User, target_date: date = None) -> DailySummary:
+    def upsert_daily_summaries(self, rows: List[Dict]):
+        """Insert or overwrite many users' daily summaries with a single INSERT ... ON CONFLICT"""
+        if not rows:
+            return
+        try:
+            insert = pg_insert if self.db.bind.dialect.name == "postgresql" else sqlite_insert
+            stmt = insert(DailySummary).values(rows)
+            columns = DailySummary.__table__.c
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'summary_date'],
+                set_={
+                    column.name: stmt.excluded[column.name]
+                    for column in DailySummary.__table__.columns
+                    if column.name not in ('id', 'user_id', 'summary_date', 'created_at')
+                },
+                # Rows whose counters didn't move are left alone (no write, no WAL)
+                where=or_(*(columns[field].is_distinct_from(stmt.excluded[field]) for field in _STAT_FIELDS))
+            )
+            self.db.execute(stmt)
+            self.db.commit()
+            for row in rows:
+                _summary_cache.pop((row['user_id'], row['summary_date']), None)
+            
+            logger.info(f"Upserted {len(rows)} daily summaries")
+            
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error upserting daily summaries: {e}")
+            raise
+    
+    def get_user_summary(self, user: User, target_date: date = None) -> Optional[DailySummaryResponse]:
         try:
             if not target_date:
                 target_date = self.get_wat_date()
             
+            cache_key = (user.id, target_date)
+            cached = _summary_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             summary = self.db.query(DailySummary).filter(
                 and_(
                     DailySummary.user_id == user.id,
@@ -247,6 +370,11 @@ class SummaryService:
                 )
             ).first()
             
+            # Missing days aren't cached, so an on-demand generation shows up immediately
+            if summary:
+                summary = DailySummaryResponse.model_validate(summary)
+                _summary_cache[cache_key] = summary
+            
             return summary
             
         except Exception as e:
@@ -270,12 +398,66 @@ class SummaryService:
             raise
 
 
+def _send_summary_email(recipient: tuple) -> bool:
+    user, row, db = recipient
+    try:
+        stats = {
+            'total': row['total_tasks'],
+            'completed': row['completed_tasks'],
+            'pending': row['pending_tasks'],
+            'overdue': row['overdue_tasks'],
+            'due_today': 0  # Not applicable for past day
+        }
+        sent = send_daily_task_summary(user, db, stats)
+        if sent:
+            logger.info(f"Sent daily summary email to {user.email}")
+        return bool(sent)
+    except Exception as email_error:
+        logger.warning(f"Failed to send summary email to {user.email}: {email_error}")
+        return False
+
+
+def _summarize_user_batch(summary_service: SummaryService, users: List, target_date: date, stats_by_user: Dict) -> int:
+    """Upsert one batch of users' summaries and email them; returns the number of failed emails"""
+    now = datetime.now(WAT)
+    rows = []
+    for user in users:
+        stats = stats_by_user[user.id]
+        rows.append({
+            'user_id': user.id,
+            'summary_date': target_date,
+            'total_tasks': stats['total_tasks'],
+            'completed_tasks': stats['completed_tasks'],
+            'pending_tasks': stats['pending_tasks'],
+            'overdue_tasks': stats['overdue_tasks'],
+            'meetings_count': stats['meetings_count'],
+            'emails_processed': stats['emails_processed'],
+            'emails_sent': stats['emails_sent'],
+            'summary_text': summary_service.generate_summary_text(stats),
+            'created_at': now,
+            'updated_at': now
+        })
+    
+    # The whole batch in one statement and one commit
+    summary_service.upsert_daily_summaries(rows)
+    
+    for user, row in zip(users, rows):
+        logger.info(f"Generated summary for user {user.id}: {row['summary_text']}")
+    
+    # Each email is a Gmail API round trip, so send them side by side
+    recipients = [(user, row, summary_service.db) for user, row in zip(users, rows) if user.can_email]
+    with ThreadPoolExecutor(max_workers=SUMMARY_EMAIL_WORKERS, thread_name_prefix="daily-summary") as pool:
+        sent = list(pool.map(_send_summary_email, recipients))
+    
+    return sent.count(False)
+
+
 def generate_all_daily_summaries():
     """
     Background job to generate daily summaries for all users
     Runs at midnight UTC (1 AM WAT)
     """
-    db: Session = SessionLocal()
+    db: Session = BackgroundSessionLocal()
     try:
         logger.info("Starting daily summary generation job...")
         
@@ -289,40 +471,32 @@ def generate_all_daily_summaries():
         
         logger.info(f"Generating summaries for date: {target_date}")
         
-        # Get all active users
-        users = db.query(User).filter(User.is_active == True).all()
-        
         summary_service = SummaryService(db)
+        stats_by_user = summary_service.collect_all_users_daily_stats(target_date)
         success_count = 0
         error_count = 0
         
-        for user in users:
-            try:
-                # Generate summary
-                summary = summary_service.create_or_update_daily_summary(user, target_date)
-                
-                # Send email notification
-                if user.email and user.google_access_token:
-                    try:
-                        stats = {
-                            'total': summary.total_tasks,
-                            'completed': summary.completed_tasks,
-                            'pending': summary.pending_tasks,
-                            'overdue': summary.overdue_tasks,
-                            'due_today': 0  # Not applicable for past day
-                        }
-                        send_daily_task_summary(user.email, stats)
-                        logger.info(f"Sent daily summary email to {user.email}")
-                    except Exception as email_error:
-                        logger.warning(f"Failed to send summary email to {user.email}: {email_error}")
-                
-                success_count += 1
-                logger.info(f"Generated summary for user {user.id}: {summary.summary_text}")
-                
-            except Exception as user_error:
-                error_count += 1
-                logger.error(f"Error generating summary for user {user.id}: {user_error}")
-                continue
+        # Walk active users in id order, one batch at a time, so memory stays flat however many there are
+        last_id = 0
+        while True:
+            # Only the columns the job and the Gmail client read; whether a user can be emailed is decided in SQL
+            users = db.query(
+                User.id,
+                User.email,
+                User.google_access_token,
+                User.google_refresh_token,
+                and_(User.email.isnot(None), User.google_access_token.isnot(None)).label('can_email')
+            ).filter(
+                User.is_active == True,
+                User.id > last_id
+            ).order_by(User.id).limit(SUMMARY_USER_BATCH).all()
+            if not users:
+                break
+            last_id = users[-1].id
+            
+            failed = _summarize_user_batch(summary_service, users, target_date, stats_by_user)
+            error_count += failed
+            success_count += len(users) - failed
         
         logger.info(f"Daily summary job completed. Success: {success_count}, Errors: {error_count}")
         
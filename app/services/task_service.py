@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, case, delete, func, or_, select, update
 from datetime import datetime, timedelta
 from typing import List, Optional
 from ..db.models.task import Task
@@ -10,6 +10,13 @@ from .scheduler import schedule_task_reminder
 
 logger = get_logger(__name__)
 
+
+def _utc_day_bounds(now: datetime) -> tuple:
+    """Start of the UTC day containing now, and the start of the next one"""
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today_start, today_start + timedelta(days=1)
+
+
 class TaskService:
     def __init__(self, db: Session, user: User):
         self.db = db
@@ -51,10 +58,10 @@ class TaskService:
     ) -> List[Task]:
         try:
             query = self.db.query(Task).filter(Task.user_id == self.user.id)
+            now = datetime.utcnow()
             
             if filter_type == "due_today":
-                today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-                today_end = today_start + timedelta(days=1)
+                today_start, today_end = _utc_day_bounds(now)
                 query = query.filter(
                     and_(
                         Task.due_date >= today_start,
@@ -65,7 +72,7 @@ class TaskService:
             elif filter_type == "overdue":
                 query = query.filter(
                     and_(
-                        Task.due_date < datetime.utcnow(),
+                        Task.due_date < now,
                         Task.is_completed == False
                     )
                 )
@@ -146,13 +153,16 @@ class TaskService:
     
     def delete_task(self, task_id: int) -> bool:
         try:
-            task = self.get_task_by_id(task_id)
-            if not task:
-                return False
-            
-            self.db.delete(task)
+            # Ownership check and delete in one statement
+            deleted = self.db.execute(
+                delete(Task).where(Task.id == task_id, Task.user_id == self.user.id)
+            ).rowcount
             self.db.commit()
             
+            if not deleted:
+                logger.warning(f"Task {task_id} not found for user {self.user.id}")
+                return False
+            
             logger.info(f"Task deleted: {task_id}")
             return True
             
@@ -163,15 +173,19 @@ class TaskService:
     
     def mark_as_completed(self, task_id: int) -> Optional[Task]:
         try:
-            task = self.get_task_by_id(task_id)
+            # Ownership check, update and reload in one statement
+            task = self.db.execute(
+                update(Task)
+                .where(Task.id == task_id, Task.user_id == self.user.id)
+                .values(is_completed=True, updated_at=datetime.utcnow())
+                .returning(Task)
+            ).scalar_one_or_none()
+            self.db.commit()
+            
             if not task:
+                logger.warning(f"Task {task_id} not found for user {self.user.id}")
                 return None
             
-            task.is_completed = True
-            task.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(task)
-            
             logger.info(f"Task marked as completed: {task_id}")
             return task
             
@@ -182,31 +196,22 @@ class TaskService:
     
     def get_task_stats(self) -> TaskStats:
         try:
-            total = self.db.query(Task).filter(Task.user_id == self.user.id).count()
-            completed = self.db.query(Task).filter(
-                and_(Task.user_id == self.user.id, Task.is_completed == True)
-            ).count()
+            now = datetime.utcnow()
+            today_start, today_end = _utc_day_bounds(now)
+            
+            # All counters in one pass over the user's tasks
+            total, completed, overdue, due_today = self.db.execute(
+                select(
+                    func.count(),
+                    func.count(case((Task.is_completed == True, 1))),
+                    func.count(case((and_(Task.due_date < now, Task.is_completed == False), 1))),
+                    func.count(case((
+                        and_(Task.due_date >= today_start, Task.due_date < today_end, Task.is_completed == False), 1
+                    )))
+                ).where(Task.user_id == self.user.id)
+            ).one()
             pending = total - completed
             
-            overdue = self.db.query(Task).filter(
-                and_(
-                    Task.user_id == self.user.id,
-                    Task.due_date < datetime.utcnow(),
-                    Task.is_completed == False
-                )
-            ).count()
-            
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            today_end = today_start + timedelta(days=1)
-            due_today = self.db.query(Task).filter(
-                and_(
-                    Task.user_id == self.user.id,
-                    Task.due_date >= today_start,
-                    Task.due_date < today_end,
-                    Task.is_completed == False
-                )
-            ).count()
-            
             return TaskStats(
                 total=total,
                 completed=completed,
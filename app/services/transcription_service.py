@@ -1,17 +1,72 @@
 import asyncio
 import logging
 import subprocess
-import tempfile
+import threading
 import os
+import numpy as np
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy.orm import Session
+import torch
 import whisper
 from ..db.models.meeting import Meeting
 from .meeting_service import MeetingService
 
 logger = logging.getLogger(__name__)
 
+# "base.en" is smaller and faster when every meeting is in English
+WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL", "base")
+WHISPER_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+# Half precision is only supported (and only faster) on the GPU
+WHISPER_FP16 = WHISPER_DEVICE == "cuda"
+
+# Clients stream 16 kHz mono 16-bit little-endian PCM, which Whisper takes as-is
+SAMPLE_RATE = whisper.audio.SAMPLE_RATE
+# Transcribe once this much audio is buffered, and never more than Whisper's 30s window at a time
+MIN_TRANSCRIBE_SAMPLES = SAMPLE_RATE * 3
+MAX_WINDOW_SAMPLES = whisper.audio.N_SAMPLES
+
+# Energy gate in front of Whisper: 30 ms frames above ~-40 dBFS count as speech
+VAD_FRAME_SAMPLES = SAMPLE_RATE * 30 // 1000
+VAD_RMS_THRESHOLD = 0.01
+MIN_SPEECH_RATIO = 0.1
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+# transcribe() installs kv-cache hooks on the model, so calls on the shared model must not overlap
+_inference_lock = threading.Lock()
+
+
+def get_whisper_model():
+    """Load the Whisper model on first use and share it across all meetings"""
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                logger.info(f"Loading Whisper model '{WHISPER_MODEL_NAME}' on {WHISPER_DEVICE}...")
+                _whisper_model = whisper.load_model(WHISPER_MODEL_NAME, device=WHISPER_DEVICE)
+                logger.info("Whisper model loaded successfully")
+    return _whisper_model
+
+
+def _has_speech(audio: np.ndarray) -> bool:
+    """Cheap voice-activity check so silent stretches (mute, hold) never reach Whisper"""
+    frame_count = len(audio) // VAD_FRAME_SAMPLES
+    if not frame_count:
+        return False
+    frames = audio[:frame_count * VAD_FRAME_SAMPLES].reshape(frame_count, VAD_FRAME_SAMPLES)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return np.count_nonzero(rms > VAD_RMS_THRESHOLD) / frame_count >= MIN_SPEECH_RATIO
+
+
+def _transcribe(model, audio: np.ndarray) -> dict:
+    with _inference_lock:
+        return model.transcribe(
+            audio,
+            language="en",  # Auto-detect if None
+            fp16=WHISPER_FP16
+        )
+
 
 class TranscriptionService:
     # Handles audio capture and real-time transcription using Whisper
@@ -22,27 +77,25 @@ class TranscriptionService:
         self.meeting_service = MeetingService(db)
         self.is_running = False
         self.sequence_number = 0
-        self.audio_buffer = []
+        # Untranscribed audio as float32 samples in [-1, 1]
+        self.pcm = np.empty(0, dtype=np.float32)
+        # A chunk can end mid-sample; the odd byte waits for the next chunk
+        self._partial_sample = b""
+        self._transcribe_lock = asyncio.Lock()
         
-        logger.info("Loading Whisper model...")
-        self.whisper_model = whisper.load_model("base")
-        logger.info("Whisper model loaded successfully")
+        self.whisper_model = get_whisper_model()
         
         # WebSocket connections for this meeting
-        self.websocket_connections = []
+        self.websocket_connections: set = set()
         
         # FFmpeg process
         self.ffmpeg_process: Optional[subprocess.Popen] = None
-        self.temp_audio_file = None
     
     async def start(self):
         self.is_running = True
         logger.info(f"Starting transcription service for meeting {self.meeting_id}")
         
         try:
-            # Create temporary file for audio chunks
-            self.temp_audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            
             # Start FFmpeg to capture system audio
             await self.start_capture()
             
@@ -63,15 +116,8 @@ class TranscriptionService:
             self.ffmpeg_process.terminate()
             self.ffmpeg_process.wait()
         
-        # Clean up temporary file
-        if self.temp_audio_file:
-            try:
-                os.unlink(self.temp_audio_file.name)
-            except:
-                pass
-        
         # Close all WebSocket connections
-        for ws in self.websocket_connections:
+        for ws in list(self.websocket_connections):
             try:
                 await ws.close()
             except:
@@ -104,15 +150,16 @@ class TranscriptionService:
     
     async def process_audio_chunk(self, audio_data: bytes):
         try:
-            # Write audio chunk to temporary file
-            self.temp_audio_file.write(audio_data)
-            self.temp_audio_file.flush()
+            audio_data = self._partial_sample + audio_data
+            usable = len(audio_data) - len(audio_data) % 2
+            self._partial_sample = audio_data[usable:]
             
             # Add to buffer for transcription
-            self.audio_buffer.append(audio_data)
+            samples = np.frombuffer(audio_data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+            self.pcm = np.concatenate((self.pcm, samples))
             
-            # Trigger transcription every N chunks or N seconds
-            if len(self.audio_buffer) >= 10:  # Process every 10 chunks
+            # Don't let a fast sender outrun the 3 second loop past one Whisper window
+            if len(self.pcm) >= MAX_WINDOW_SAMPLES:
                 await self.transcribe_buffer()
                 
         except Exception as e:
@@ -127,7 +174,7 @@ class TranscriptionService:
                 # Wait for audio buffer to accumulate
                 await asyncio.sleep(3)  # Transcribe every 3 seconds
                 
-                if self.audio_buffer:
+                if len(self.pcm) >= MIN_TRANSCRIBE_SAMPLES:
                     await self.transcribe_buffer()
                     retry_count = 0  # Reset retry count on success
                     
@@ -144,17 +191,24 @@ class TranscriptionService:
                 await asyncio.sleep(2)
     
     async def transcribe_buffer(self):
-        if not self.audio_buffer:
+        # Chunks must be saved in order, so one window per meeting at a time
+        async with self._transcribe_lock:
+            await self._transcribe_window()
+    
+    async def _transcribe_window(self):
+        if not len(self.pcm):
+            return
+        
+        # Only the audio that hasn't been transcribed yet, so each call costs one window
+        window = self.pcm[:MAX_WINDOW_SAMPLES]
+        self.pcm = self.pcm[len(window):]
+        
+        if not _has_speech(window):
             return
         
         try:
-            # Use the temporary audio file for transcription
-            # Whisper expects a file path
-            result = self.whisper_model.transcribe(
-                self.temp_audio_file.name,
-                language="en",  # Auto-detect if None
-                fp16=False  # Set to True if using GPU
-            )
+            # Inference is blocking; run it off the event loop so sockets keep flowing
+            result = await asyncio.to_thread(_transcribe, self.whisper_model, window)
             
             text = result['text'].strip()
             
@@ -173,41 +227,37 @@ class TranscriptionService:
                 # Broadcast to WebSocket clients
                 await self.broadcast_transcript({
                     "meeting_id": self.meeting_id,
-                    "timestamp": transcript.timestamp.isoformat(),
+                    "timestamp": transcript["timestamp"].isoformat(),
                     "text": text,
                     "sequence_number": self.sequence_number,
                     "is_final": True
                 })
             
-            # Clear buffer and reset temp file
-            self.audio_buffer = []
-            self.temp_audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            
         except Exception as e:
             logger.error(f"Error transcribing audio: {e}")
             raise
     
     async def broadcast_transcript(self, data: dict):
-        disconnected = []
-        
-        for ws in self.websocket_connections:
-            try:
-                await ws.send_json(data)
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket client: {e}")
-                disconnected.append(ws)
+        # Send to every client at once so one slow socket doesn't hold up the rest
+        sockets = list(self.websocket_connections)
+        results = await asyncio.gather(
+            *(ws.send_json(data) for ws in sockets),
+            return_exceptions=True
+        )
         
         # Remove disconnected clients
-        for ws in disconnected:
-            self.websocket_connections.remove(ws)
+        for ws, result in zip(sockets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send to WebSocket client: {result}")
+                self.remove_websocket(ws)
     
     def add_websocket(self, websocket):
         # Add a WebSocket connection for this meeting
-        self.websocket_connections.append(websocket)
+        self.websocket_connections.add(websocket)
         logger.info(f"WebSocket connected for meeting {self.meeting_id}")
     
     def remove_websocket(self, websocket):
         # Remove a WebSocket connection
         if websocket in self.websocket_connections:
-            self.websocket_connections.remove(websocket)
+            self.websocket_connections.discard(websocket)
             logger.info(f"WebSocket disconnected from meeting {self.meeting_id}")
\ No newline at end of file
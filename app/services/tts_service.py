@@ -1,8 +1,129 @@
 from gtts import gTTS
+from gtts.tts import gTTSError
+import httpx
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import hashlib
+import itertools
 import os
+import re
+import shutil
+import subprocess
+import threading
 from pathlib import Path
 from typing import Optional
-import uuid
+
+
+# Recently generated file paths kept in memory in front of the disk cache
+MEMORY_CACHE_SIZE = 512
+
+# Long texts are synthesized sentence by sentence in parallel; MP3 frames concatenate cleanly
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_synthesis_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts")
+
+
+# Texts without a two-character word ("", ".", "-") aren't worth a gTTS round trip
+_SPEAKABLE_RE = re.compile(r'[^\W_]{2,}')
+
+# ~0.26s of silence: ten mono 128 kbps / 44.1 kHz MPEG-1 Layer III frames with empty side info
+_SILENT_MP3 = (b'\xff\xfb\x90\xc0' + bytes(413)) * 10
+
+# Same pattern gTTS 2.5's own stream() parses responses with (see app/tests/test_tts.py)
+_AUDIO_LINE_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+# Per process, since neither survives a fork into another worker
+_http_state: dict = {}
+_http_state_lock = threading.Lock()
+
+
+def _http() -> tuple:
+    """Shared HTTP/2 client and chunk fetch pool for this process"""
+    with _http_state_lock:
+        if _http_state.get('pid') != os.getpid():
+            _http_state.update(
+                pid=os.getpid(),
+                client=httpx.Client(http2=True, limits=httpx.Limits(max_keepalive_connections=8)),
+                pool=ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts-chunk")
+            )
+        return _http_state['client'], _http_state['pool']
+
+
+class _UnexpectedResponse(gTTSError):
+    """The TTS API answered in a shape _MultiplexedTTS doesn't know how to parse"""
+
+
+class _MultiplexedTTS(gTTS):
+    """
+    gTTS whose ~100 character chunks are fetched concurrently as streams on one
+    HTTP/2 connection, instead of serially with a new session per chunk.
+    Built on gTTS's private _prepare_requests, so requirements.txt pins gTTS exactly
+    """
+    
+    def stream(self):
+        client, pool = _http()
+        
+        def fetch(prepared) -> httpx.Response:
+            headers = {k: v for k, v in prepared.headers.items() if k.lower() != 'content-length'}
+            try:
+                response = client.request(
+                    prepared.method, prepared.url, headers=headers, content=prepared.body, timeout=self.timeout
+                )
+            except httpx.HTTPError as e:
+                raise gTTSError(f"Failed to connect to TTS API: {e}")
+            if response.is_error:
+                raise gTTSError(f"{response.status_code} ({response.reason_phrase}) from TTS API")
+            return response
+        
+        # map keeps chunk order while the requests overlap
+        for response in pool.map(fetch, self._prepare_requests()):
+            found = False
+            for line in response.text.splitlines():
+                if "jQ1olc" in line:
+                    audio_search = _AUDIO_LINE_RE.search(line)
+                    if not audio_search:
+                        raise _UnexpectedResponse("No audio stream in TTS API response")
+                    found = True
+                    yield base64.b64decode(audio_search.group(1).encode("ascii"))
+            if not found:
+                raise _UnexpectedResponse("No audio stream in TTS API response")
+
+
+# A gTTS upgrade that drops the private hook falls back to its public, serial path
+_MULTIPLEXED = callable(getattr(gTTS, '_prepare_requests', None))
+
+
+_tmp_counter = itertools.count()
+
+
+def _tmp_path(filepath) -> Path:
+    # pid + a process-local counter is unique without touching the OS RNG
+    return Path(f"{filepath}.{os.getpid()}.{next(_tmp_counter)}.tmp")
+
+
+def _write_speech(text: str, lang: str, slow: bool, output):
+    if _MULTIPLEXED:
+        try:
+            _MultiplexedTTS(text=text, lang=lang, slow=slow).write_to_fp(output)
+            return
+        except _UnexpectedResponse:
+            # The API changed under the private path; start over on gTTS's public one
+            output.seek(0)
+            output.truncate()
+    gTTS(text=text, lang=lang, slow=slow).write_to_fp(output)
+
+
+def _synthesize(text: str, lang: str, slow: bool, filepath: str):
+    """Render text to filepath"""
+    # Save under a unique temp name, then rename, so concurrent requests for
+    # the same text never read a half-written file
+    tmp_path = _tmp_path(filepath)
+    try:
+        with open(tmp_path, 'wb') as output:
+            _write_speech(text, lang, slow, output)
+        os.replace(tmp_path, filepath)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 class TTSService:
@@ -11,6 +132,12 @@ class TTSService:
     def __init__(self):
         self.output_dir = Path("audio_files")
         self.output_dir.mkdir(exist_ok=True)
+        # (text, lang, slow) -> file path, least recently used first
+        self._mem_cache: OrderedDict = OrderedDict()
+        self._mem_lock = threading.Lock()
+        self._empty_path = self.output_dir / "empty.mp3"
+        if not self._empty_path.exists():
+            self._empty_path.write_bytes(_SILENT_MP3)
     
     def generate_audio(self, text: str, lang: str = 'en', slow: bool = False) -> str:
         """
@@ -24,17 +151,41 @@ class TTSService:
         Returns:
             Path to generated audio file
         """
+        if not _SPEAKABLE_RE.search(text or ''):
+            return str(self._empty_path)
+        
+        memo_key = (text, lang, slow)
+        with self._mem_lock:
+            path = self._mem_cache.get(memo_key)
+            if path is not None:
+                self._mem_cache.move_to_end(memo_key)
+                return path
+        
+        path = self._generate_audio_file(text, lang, slow)
+        self._remember(memo_key, path)
+        return path
+    
+    def _remember(self, memo_key: tuple, path: str):
+        with self._mem_lock:
+            self._mem_cache[memo_key] = path
+            if len(self._mem_cache) > MEMORY_CACHE_SIZE:
+                self._mem_cache.popitem(last=False)
+    
+    def _audio_path(self, text: str, lang: str, slow: bool) -> Path:
+        # Same text, language and speed always produce the same file name
+        key = hashlib.blake2b(f"{lang}|{int(slow)}|{text}".encode(), digest_size=16).hexdigest()
+        return self.output_dir / f"tts_{key}.mp3"
+    
+    def _generate_audio_file(self, text: str, lang: str, slow: bool) -> str:
         try:
-            # Generate unique filename
-            filename = f"tts_{uuid.uuid4()}.mp3"
-            filepath = self.output_dir / filename
+            filepath = self._audio_path(text, lang, slow)
             
-            # Create TTS object
-            tts = gTTS(text=text, lang=lang, slow=slow)
-            
-            # Save audio file
-            tts.save(str(filepath))
+            if filepath.exists():
+                # Refresh mtime so cleanup_old_files only evicts audio nobody has asked for lately
+                os.utime(filepath)
+                return str(filepath)
             
+            _synthesize(text, lang, slow, str(filepath))
             return str(filepath)
             
         except Exception as e:
@@ -50,18 +201,74 @@ class TTSService:
         intro = f"Email from {sender}. Subject: {subject}. Summary: "
         full_text = intro + summary
         
-        return self.generate_audio(full_text)
+        # The intro is one segment so every email in a thread reuses the same cached audio
+        segments = [intro.strip()]
+        segments += [sentence for sentence in _SENTENCE_SPLIT_RE.split(summary) if sentence.strip()]
+        if len(segments) == 1:
+            return self.generate_audio(full_text)
+        
+        memo_key = (full_text, 'en', False)
+        with self._mem_lock:
+            path = self._mem_cache.get(memo_key)
+        if path is not None:
+            return path
+        
+        filepath = self._audio_path(full_text, 'en', False)
+        if not filepath.exists():
+            try:
+                # Each segment is its own cached request, so only new sentences hit gTTS
+                parts = list(_synthesis_pool.map(self.generate_audio, segments))
+                
+                tmp_path = _tmp_path(filepath)
+                with open(tmp_path, 'wb') as output:
+                    for part in parts:
+                        with open(part, 'rb') as audio:
+                            output.write(audio.read())
+                os.replace(tmp_path, filepath)
+            except Exception as e:
+                raise Exception(f"Error generating audio: {e}")
+        
+        self._remember(memo_key, str(filepath))
+        return str(filepath)
     
     def cleanup_old_files(self, max_age_hours: int = 24):
         """Remove audio files older than specified hours"""
         import time
         current_time = time.time()
         
-        for file in self.output_dir.glob("*.mp3"):
-            file_age = current_time - file.stat().st_mtime
-            if file_age > max_age_hours * 3600:
-                file.unlink()
+        max_age = max_age_hours * 3600
+        removed = self._find_delete(max_age)
+        if removed is None:
+            removed = set()
+            # scandir entries carry their stat from the directory read, so this is one pass
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith("tts_") and entry.name.endswith(".mp3") and current_time - entry.stat(follow_symlinks=False).st_mtime > max_age:
+                        os.unlink(entry.path)
+                        removed.add(str(self.output_dir / entry.name))
+        
+        # Forget deleted files so the next request synthesizes them again
+        if removed:
+            with self._mem_lock:
+                for memo_key in [k for k, path in self._mem_cache.items() if path in removed]:
+                    del self._mem_cache[memo_key]
+    
+    def _find_delete(self, max_age: int) -> Optional[set]:
+        """Let find(1) stat and unlink stale files in C; None when it isn't available"""
+        find = shutil.which("find")
+        if find is None:
+            return None
+        minutes = max(max_age // 60, 1)
+        try:
+            result = subprocess.run(
+                [find, str(self.output_dir), "-maxdepth", "1", "-type", "f", "-name", "tts_*.mp3",
+                 "-mmin", f"+{minutes}", "-print", "-delete"],
+                capture_output=True, text=True, check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return set(result.stdout.splitlines())
 
 
 # Singleton instance
-tts_service = TTSService()
\ No newline at end of file
+tts_service = TTSService()
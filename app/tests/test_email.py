@@ -3,6 +3,7 @@ Test script for AI email processing
 Run this after starting the server to test email AI features
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from pprint import pprint
 
@@ -15,6 +16,11 @@ headers = {
     "Content-Type": "application/json"
 }
 
+# One keep-alive connection to the server for every test instead of a new one per request
+session = requests.Session()
+session.headers.update(headers)
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 
 def test_list_unread_emails():
     """Test listing unread emails with categories"""
@@ -22,9 +28,8 @@ def test_list_unread_emails():
     print("TEST 1: List Unread Emails")
     print("="*50)
     
-    response = requests.get(
+    response = session.get(
         f"{BASE_URL}/email/unread-list",
-        headers=headers,
         params={"limit": 5}
     )
     
@@ -61,10 +66,7 @@ def test_get_categories():
     print("TEST 2: Get Email Categories")
     print("="*50)
     
-    response = requests.get(
-        f"{BASE_URL}/email/categories",
-        headers=headers
-    )
+    response = session.get(f"{BASE_URL}/email/categories")
     
     if response.status_code == 200:
         data = response.json()
@@ -82,9 +84,8 @@ def test_process_email_with_ai(message_id):
     print("="*50)
     print(f"Processing message ID: {message_id}")
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/email/process",
-        headers=headers,
         json={"message_id": message_id}
     )
     
@@ -124,9 +125,8 @@ def test_get_email_summaries():
     print("TEST 4: Get Stored Email Summaries")
     print("="*50)
     
-    response = requests.get(
+    response = session.get(
         f"{BASE_URL}/email/summaries",
-        headers=headers,
         params={"limit": 5}
     )
     
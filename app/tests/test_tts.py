@@ -0,0 +1,24 @@
+"""
+Checks the gTTS internals app/services/tts_service.py builds on
+Run with pytest after changing the pinned gTTS version; no network access needed
+"""
+import inspect
+
+from gtts import gTTS
+
+from app.services.tts_service import _AUDIO_LINE_RE
+
+
+def test_prepare_requests_builds_one_request_per_chunk():
+    """_MultiplexedTTS sends these prepared requests itself"""
+    prepared = gTTS(text="This sentence is long enough to be split. " * 5, lang="en")._prepare_requests()
+    assert len(prepared) > 1
+    for request in prepared:
+        assert request.method == "POST"
+        assert request.url.startswith("https://")
+        assert request.body
+
+
+def test_audio_line_pattern_matches_gtts():
+    """The response parsing must follow whatever gTTS.stream does"""
+    assert _AUDIO_LINE_RE.pattern in inspect.getsource(gTTS.stream)
@@ -1,38 +1,18 @@
+import asyncio
 from datetime import datetime
+from html import escape
+from string import Template
 from typing import Optional
 from sqlalchemy.orm import Session
 from ..db.models.user import User
 from ..services.email_service import GmailService
-from ..db.session import SessionLocal
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def send_task_reminder_email(
-    to_email: str,
-    task_title: str,
-    task_description: Optional[str],
-    due_date: datetime
-):
-    db: Session = SessionLocal()
-    try:
-        user = db.query(User).filter(User.email == to_email).first()
-        
-        if not user:
-            logger.error(f"User with email {to_email} not found")
-            return False
-        
-        if not user.google_access_token:
-            logger.warning(f"User {to_email} doesn't have Gmail connected")
-            return False
-        
-        gmail_service = GmailService(user, db)
-        
-        due_str = due_date.strftime("%B %d, %Y at %I:%M %p")
-        
-        # Create HTML email body
-        html_body = f"""
+# Email bodies are parsed once at import; user-supplied text is escaped on substitution
+_REMINDER_TPL = Template("""
         <html>
             <body style="font-family: Arial, sans-serif; line-height: 1.6;">
                 <div style="max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f4f4f4;">
@@ -40,12 +20,12 @@ def send_task_reminder_email(
                         ⏰ Task Reminder
                     </h2>
                     <div style="background-color: white; padding: 20px; border-radius: 5px; margin-top: 20px;">
-                        <h3 style="color: #007bff; margin-top: 0;">{task_title}</h3>
+                        <h3 style="color: #007bff; margin-top: 0;">$task_title</h3>
                         <p style="margin: 10px 0;">
                             <strong>📅 Due:</strong> 
-                            <span style="color: #dc3545;">{due_str}</span>
+                            <span style="color: #dc3545;">$due_str</span>
                         </p>
-                        {f'<div style="margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-left: 4px solid #007bff;"><strong>Description:</strong><br>{task_description}</div>' if task_description else ''}
+                        $description_block
                         <p style="margin-top: 20px; padding: 15px; background-color: #fff3cd; border-radius: 5px;">
                             ⚡ This task is now due. Please complete it at your earliest convenience.
                         </p>
@@ -56,47 +36,13 @@ def send_task_reminder_email(
                 </div>
             </body>
         </html>
-        """
-        
-        # Send email using Gmail API
-        subject = f"⏰ Task Reminder: {task_title}"
-        
-        gmail_service.send_email(
-            to=to_email,
-            subject=subject,
-            body=html_body
-        )
-        
-        logger.info(f"Task reminder sent via Gmail to {to_email} for task: {task_title}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error sending task reminder via Gmail: {e}")
-
-        # Fallback to console notification
-        print(f"\nTASK REMINDER:")
-        print(f"To: {to_email}")
-        print(f"Task: {task_title}")
-        print(f"Due: {due_date.strftime('%B %d, %Y at %I:%M %p')}")
-        if task_description:
-            print(f"Description: {task_description}")
-        return False
-    finally:
-        db.close()
+        """)
 
+_DESCRIPTION_TPL = Template(
+    '<div style="margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-left: 4px solid #007bff;"><strong>Description:</strong><br>$task_description</div>'
+)
 
-def send_task_completion_email(to_email: str, task_title: str):
-    db: Session = SessionLocal()
-    try:
-        user = db.query(User).filter(User.email == to_email).first()
-        
-        if not user or not user.google_access_token:
-            logger.warning(f"Cannot send completion email to {to_email} - Gmail not connected")
-            return False
-        
-        gmail_service = GmailService(user, db)
-        
-        html_body = f"""
+_COMPLETION_TPL = Template("""
         <html>
             <body style="font-family: Arial, sans-serif;">
                 <div style="max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f4f4f4;">
@@ -105,7 +51,7 @@ def send_task_completion_email(to_email: str, task_title: str):
                     </h2>
                     <div style="background-color: white; padding: 20px; border-radius: 5px; margin-top: 20px;">
                         <p style="font-size: 18px; margin: 0;">
-                            <strong style="color: #28a745;">{task_title}</strong>
+                            <strong style="color: #28a745;">$task_title</strong>
                         </p>
                         <p style="margin-top: 20px; padding: 15px; background-color: #d4edda; border-radius: 5px; color: #155724;">
                             🎉 Great job! This task has been marked as completed.
@@ -120,36 +66,9 @@ def send_task_completion_email(to_email: str, task_title: str):
                 </div>
             </body>
         </html>
-        """
-        
-        gmail_service.send_email(
-            to=to_email,
-            subject=f"✅ Task Completed: {task_title}",
-            body=html_body
-        )
-        
-        logger.info(f"Task completion email sent via Gmail to {to_email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error sending completion email via Gmail: {e}")
-        return False
-    finally:
-        db.close()
-
+        """)
 
-def send_daily_task_summary(to_email: str, stats: dict):
-    db: Session = SessionLocal()
-    try:
-        user = db.query(User).filter(User.email == to_email).first()
-        
-        if not user or not user.google_access_token:
-            logger.warning(f"Cannot send daily summary to {to_email} - Gmail not connected")
-            return False
-        
-        gmail_service = GmailService(user, db)
-        
-        html_body = f"""
+_SUMMARY_TPL = Template("""
         <html>
             <body style="font-family: Arial, sans-serif;">
                 <div style="max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f4f4f4;">
@@ -159,19 +78,19 @@ def send_daily_task_summary(to_email: str, stats: dict):
                     <div style="background-color: white; padding: 20px; border-radius: 5px; margin-top: 20px;">
                         <div style="display: grid; gap: 15px;">
                             <div style="padding: 15px; background-color: #e3f2fd; border-radius: 5px;">
-                                <h3 style="margin: 0; color: #1976d2;">📝 Total Tasks: {stats.get('total', 0)}</h3>
+                                <h3 style="margin: 0; color: #1976d2;">📝 Total Tasks: $total</h3>
                             </div>
                             <div style="padding: 15px; background-color: #d4edda; border-radius: 5px;">
-                                <h3 style="margin: 0; color: #28a745;">✅ Completed: {stats.get('completed', 0)}</h3>
+                                <h3 style="margin: 0; color: #28a745;">✅ Completed: $completed</h3>
                             </div>
                             <div style="padding: 15px; background-color: #fff3cd; border-radius: 5px;">
-                                <h3 style="margin: 0; color: #856404;">⏳ Pending: {stats.get('pending', 0)}</h3>
+                                <h3 style="margin: 0; color: #856404;">⏳ Pending: $pending</h3>
                             </div>
                             <div style="padding: 15px; background-color: #f8d7da; border-radius: 5px;">
-                                <h3 style="margin: 0; color: #721c24;">⚠️ Overdue: {stats.get('overdue', 0)}</h3>
+                                <h3 style="margin: 0; color: #721c24;">⚠️ Overdue: $overdue</h3>
                             </div>
                             <div style="padding: 15px; background-color: #d1ecf1; border-radius: 5px;">
-                                <h3 style="margin: 0; color: #0c5460;">📅 Due Today: {stats.get('due_today', 0)}</h3>
+                                <h3 style="margin: 0; color: #0c5460;">📅 Due Today: $due_today</h3>
                             </div>
                         </div>
                     </div>
@@ -181,7 +100,101 @@ def send_daily_task_summary(to_email: str, stats: dict):
                 </div>
             </body>
         </html>
-        """
+        """)
+
+_SUMMARY_FIELDS = ('total', 'completed', 'pending', 'overdue', 'due_today')
+
+_DUE_FMT = "%B %d, %Y at %I:%M %p"
+
+
+def send_task_reminder_email(
+    user: User,
+    db: Session,
+    task_title: str,
+    task_description: Optional[str],
+    due_date: datetime
+):
+    # The caller looks the user up (in bulk where it can) and owns the session
+    to_email = user.email
+    # Formatted once for both the email body and the fallback log
+    due_str = due_date.strftime(_DUE_FMT)
+    try:
+        if not user.google_access_token:
+            logger.warning(f"User {to_email} doesn't have Gmail connected")
+            return False
+        
+        gmail_service = GmailService(user, db)
+        
+        # Create HTML email body
+        html_body = _REMINDER_TPL.substitute(
+            task_title=escape(task_title),
+            due_str=due_str,
+            description_block=_DESCRIPTION_TPL.substitute(task_description=escape(task_description)) if task_description else ''
+        )
+        
+        # Send email using Gmail API
+        subject = f"⏰ Task Reminder: {task_title}"
+        
+        gmail_service.send_email(
+            to=to_email,
+            subject=subject,
+            body=html_body
+        )
+        
+        logger.info(f"Task reminder sent via Gmail to {to_email} for task: {task_title}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error sending task reminder via Gmail: {e}")
+
+        # Fallback to the log, as one record rather than a line per field
+        logger.error(
+            "TASK REMINDER FALLBACK:\nTo: %s\nTask: %s\nDue: %s\nDescription: %s",
+            to_email,
+            task_title,
+            due_str,
+            task_description or '-'
+        )
+        return False
+
+
+def send_task_completion_email(user: User, db: Session, task_title: str):
+    to_email = user.email
+    try:
+        if not user.google_access_token:
+            logger.warning(f"Cannot send completion email to {to_email} - Gmail not connected")
+            return False
+        
+        gmail_service = GmailService(user, db)
+        
+        html_body = _COMPLETION_TPL.substitute(task_title=escape(task_title))
+        
+        gmail_service.send_email(
+            to=to_email,
+            subject=f"✅ Task Completed: {task_title}",
+            body=html_body
+        )
+        
+        logger.info(f"Task completion email sent via Gmail to {to_email}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error sending completion email via Gmail: {e}")
+        return False
+
+
+def send_daily_task_summary(user: User, db: Session, stats: dict):
+    to_email = user.email
+    try:
+        if not user.google_access_token:
+            logger.warning(f"Cannot send daily summary to {to_email} - Gmail not connected")
+            return False
+        
+        gmail_service = GmailService(user, db)
+        
+        html_body = _SUMMARY_TPL.substitute(
+            {field: stats.get(field, 0) for field in _SUMMARY_FIELDS}
+        )
         
         gmail_service.send_email(
             to=to_email,
@@ -195,5 +208,16 @@ def send_daily_task_summary(to_email: str, stats: dict):
     except Exception as e:
         logger.error(f"Error sending daily summary via Gmail: {e}")
         return False
-    finally:
-        db.close()
\ No newline at end of file
+
+
+# The Gmail client is synchronous, so the async variant runs each send on a worker
+# thread and the scheduler gathers them to overlap the API round trips
+async def send_task_reminder_email_async(
+    user: User,
+    db: Session,
+    task_title: str,
+    task_description: Optional[str],
+    due_date: datetime
+):
+    return await asyncio.to_thread(send_task_reminder_email, user, db, task_title, task_description, due_date)
+
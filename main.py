@@ -10,13 +10,19 @@ from app.api.v1.task import router as task_router
 from app.api.v1.summary import router as summary_router
 from app.api.v1.meeting import router as meeting_router
 from app.api.v1.meeting_ws import router as meeting_ws_router
+from app.api.v1.webhooks import router as webhooks_router
 from app.services.scheduler import start_scheduler, shutdown_scheduler
-from app.services.meeting_service import poll_calendar_for_meetings
+from app.services.meeting_service import (
+    poll_calendar_for_meetings,
+    resume_summary_jobs,
+    flush_pending_transcripts
+)
+from app.services.email_service import close_async_http
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import logging
 import os
-import atexit
 import asyncio
 
 # Import all models to register them with SQLAlchemy
@@ -31,7 +37,62 @@ origins = ["*"]
 
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
-app = FastAPI(title="Productivity Assistant API", version="1.0.0")
+POLLER_MAX_BACKOFF = 300
+
+
+async def _supervised_poll():
+    # Restart the calendar poller if it ever dies, backing off so a persistent fault doesn't spin
+    backoff = 1
+    while True:
+        started = asyncio.get_running_loop().time()
+        try:
+            await poll_calendar_for_meetings()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Meeting calendar polling crashed: {e}")
+        if asyncio.get_running_loop().time() - started > POLLER_MAX_BACKOFF:
+            backoff = 1
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, POLLER_MAX_BACKOFF)
+
+
+def _ensure_schema():
+    # Alembic only alters the meeting and daily summary tables: 2eb6f6f2d7bc
+    # (add_daily_summary_model) has an empty upgrade and no revision creates meetings,
+    # meeting_transcripts or meeting_summaries, so create_all stays on by default.
+    # Deployments whose schema already has them can skip its reflection with CREATE_TABLES=0
+    Base.metadata.create_all(bind=engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("CREATE_TABLES", "1") != "0":
+        await asyncio.to_thread(_ensure_schema)
+
+    start_scheduler()
+    logging.info("Application started - Task scheduler running")
+    
+    await resume_summary_jobs()
+
+    # Start meeting calendar polling in background
+    poller = asyncio.create_task(_supervised_poll())
+    logging.info("Meeting calendar polling started")
+
+    yield
+
+    poller.cancel()
+    try:
+        await poller
+    except asyncio.CancelledError:
+        pass
+    flush_pending_transcripts(max_age=0)
+    shutdown_scheduler()
+    await close_async_http()
+    logging.info("Application shutdown - Scheduler stopped")
+
+
+app = FastAPI(title="Productivity Assistant API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,28 +112,7 @@ app.include_router(task_router)
 app.include_router(summary_router)
 app.include_router(meeting_router)
 app.include_router(meeting_ws_router) 
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-
-@app.on_event("startup")
-async def startup_event():
-    start_scheduler()
-    logging.info("Application started - Task scheduler running")
-    
-    # Start meeting calendar polling in background
-    asyncio.create_task(poll_calendar_for_meetings())
-    logging.info("Meeting calendar polling started")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    shutdown_scheduler()
-    logging.info("Application shutdown - Scheduler stopped")
-
-
-atexit.register(shutdown_scheduler)
+app.include_router(webhooks_router)
 
 
 @app.get("/", status_code=status.HTTP_200_OK)
@@ -1,27 +1,157 @@
 import os
-from openai import OpenAI
-import dotenv
-from datetime import datetime
+import signal
+import sys
+import asyncio
+import hashlib
+import functools
+import mmap
+from collections import deque
+import msgpack
+import numpy as np
+import orjson
 
-dotenv.load_dotenv()
+# Only pay for python-dotenv's parse when there is a file to read
+if os.path.exists(".env"):
+    import dotenv
+    dotenv.load_dotenv()
 
-client = OpenAI(api_key="anything", base_url="http://localhost:12434/engines/llama.cpp/v1")
+
+# History and caches carried over between runs, rewritten every SAVE_EVERY turns and on exit
+SESSION_FILE = "session.msgpack"
+SAVE_EVERY = 5
+
+
+BASE_URL = "http://localhost:12434/engines/llama.cpp/v1"
+API_KEY = "anything"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client():
+    # httpx and openai are imported on first use, so the prompt comes up without waiting on them
+    import httpx
+
+    # One keep-alive connection reused for every turn; no read timeout since generations can be long
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=60.0),
+        timeout=httpx.Timeout(None, connect=5.0)
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=API_KEY, base_url=BASE_URL, http_client=_get_http_client())
 
 
 class ChatGPTTerminal:
 
-    def __init__(self):
-        self.client = client
+    def __init__(self, resume: bool = True):
         self.model = "ai/llama3.2:1B-Q4_0"
-        self.conversation_history = []
+        # Bounded ring buffer: compaction normally trims it first, the cap only matters
+        # when summarizing keeps failing
+        self.conversation_history: deque = deque(maxlen=64)
         self.system_prompt = "You are a helpful, friendly, and knowledgeable AI assistant."
+        # Sent byte-for-byte identical every turn so llama.cpp can reuse the prefix KV cache;
+        # anything per-turn goes into later messages, never into the system prompt
+        self._sys_msg = {"role": "system", "content": self.system_prompt}
+        # Deterministic mode sends temperature 0, the only setting where cached replies are valid
+        self.deterministic = False
+        # Parallel requests in run_batch; llama.cpp batches concurrent prompts into one forward pass
+        self.max_concurrency = 8
+        # Only the last max_turns exchanges are sent verbatim; older ones are folded into summary
+        self.max_turns = 16
+        self.summary = ""
+        self._summary_msg = None
+        # Replies keyed by a hash of model + messages + temperature; only filled in deterministic mode
+        self._cache: dict[str, str] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Semantic layer: a near-duplicate question (cosine > threshold) reuses an earlier reply
+        self.semantic_cache = True
+        self.semantic_threshold = 0.92
+        self._emb_matrix = None  # float16, one L2-normalized row per cached reply
+        self._emb_responses: list[str] = []
+        # (model, system prompt) the embedded replies were produced under
+        self._emb_scope = None
+        self._turns = 0
+        # Command name -> handler; each returns False to end the session
+        self._commands = {
+            "/exit": self._cmd_exit,
+            "/clear": self._cmd_clear,
+            "/history": self._cmd_history,
+            "/history json": self._cmd_history_json,
+            "/system": self._cmd_system,
+            "/model": self._cmd_model,
+            "/cache": self._cmd_cache,
+            "/cache stats": self._cmd_cache,
+            "/det": self._cmd_det,
+        }
+        self._resumed = resume and self._load_session()
+
+    def _load_session(self) -> bool:
+        """Restore the saved session; returns whether there was one to resume"""
+        if not os.path.exists(SESSION_FILE) or os.path.getsize(SESSION_FILE) == 0:
+            return False
+        try:
+            # Unpack straight from the mapped pages instead of reading the file into a bytes copy
+            with open(SESSION_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = msgpack.unpackb(mm, raw=False)
+            system_prompt = data["system_prompt"]
+            history = list(data["history"])
+            summary = data["summary"]
+            cache = dict(data["cache"])
+            emb_matrix = None
+            # Sessions saved before replies were scoped can't say which model wrote them
+            if data["emb_responses"] and data.get("emb_scope"):
+                emb_matrix = np.frombuffer(data["emb_matrix"], dtype=np.float16).reshape(len(data["emb_responses"]), -1).copy()
+        except (OSError, ValueError, KeyError, TypeError, msgpack.UnpackException):
+            return False  # unreadable, partial or older-format session, start fresh
+
+        self.system_prompt = system_prompt
+        self._sys_msg = {"role": "system", "content": self.system_prompt}
+        self.conversation_history.extend(history)
+        self.summary = summary
+        if self.summary:
+            self._summary_msg = {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+        self._cache.update(cache)
+        if emb_matrix is not None:
+            self._emb_matrix = emb_matrix
+            self._emb_responses = data["emb_responses"]
+            self._emb_scope = tuple(data["emb_scope"])
+        return True
+
+    def _save_session(self):
+        data = {
+            "system_prompt": self.system_prompt,
+            "history": list(self.conversation_history),
+            "summary": self.summary,
+            "cache": self._cache,
+            "emb_matrix": self._emb_matrix.tobytes() if self._emb_matrix is not None else b"",
+            "emb_responses": self._emb_responses,
+            "emb_scope": self._emb_scope,
+        }
+        tmp_path = f"{SESSION_FILE}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(msgpack.packb(data, use_bin_type=True))
+        os.replace(tmp_path, SESSION_FILE)
+
+    @property
+    def client(self):
+        return _get_client()
 
     def clear_screen(self):
         """Clear the terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Legacy Windows consoles don't understand ANSI; everything else is cleared without a shell
+        if os.name == 'nt' and not os.environ.get("WT_SESSION"):
+            os.system('cls')
+            return
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
 
     def print_header(self):
         """Print application header"""
+        from datetime import datetime
         print("=" * 70)
         print(" " * 20 + "ChatGPT Terminal Chat")
         print("=" * 70)
@@ -30,45 +160,186 @@ class ChatGPTTerminal:
         print("-" * 70)
         print("Commands:")
         print("  /clear    - Clear conversation history")
-        print("  /history  - Show conversation history")
+        print("  /history  - Show conversation history (/history json to export)")
         print("  /system   - Change system prompt")
         print("  /model    - Change model")
+        print("  /cache    - Show response cache stats")
+        print("  /det      - Toggle deterministic (cached) replies")
         print("  /exit     - Exit the application")
         print("=" * 70)
         print()
 
-    def send_message(self, user_message: str, stream: bool = True) -> str:
+    @property
+    def temperature(self) -> float:
+        return 0.0 if self.deterministic else 0.7
+
+    def _cache_key(self, messages: list) -> str:
+        payload = orjson.dumps({"m": self.model, "msgs": messages, "t": self.temperature}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    async def _embed(self, text: str):
+        response = await self.client.embeddings.create(model=self.model, input=text)
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
 
+    async def _semantic_lookup(self, user_message: str):
+        """Return (cached reply or None, query embedding or None)"""
+        try:
+            query = await self._embed(user_message)
+        except Exception:
+            # The server doesn't serve embeddings; stop asking for them this session
+            self.semantic_cache = False
+            return None, None
+        scope = (self.model, self.system_prompt)
+        if self._emb_scope != scope or (self._emb_matrix is not None and self._emb_matrix.shape[1] != len(query)):
+            # Replies written under another model or system prompt don't answer this one,
+            # and embeddings of another width can't be compared at all
+            self._reset_semantic_cache(scope)
+        if self._emb_matrix is not None and len(self._emb_responses):
+            sims = self._emb_matrix @ query.astype(np.float16)
+            best = int(sims.argmax())
+            if sims[best] > self.semantic_threshold:
+                return self._emb_responses[best], query
+        return None, query
+
+    def _reset_semantic_cache(self, scope=None):
+        self._emb_matrix = None
+        self._emb_responses = []
+        self._emb_scope = scope
+
+    def _store_reply(self, cache_key: str, query_embedding, reply: str):
+        self._cache[cache_key] = reply
+        if query_embedding is not None and self._emb_scope == (self.model, self.system_prompt):
+            row = query_embedding.astype(np.float16)[np.newaxis, :]
+            self._emb_matrix = row if self._emb_matrix is None else np.vstack([self._emb_matrix, row])
+            self._emb_responses.append(reply)
+
+    async def _compact_history(self):
+        """Fold the oldest half of the history into self.summary so each turn's prefill stays bounded"""
+        if len(self.conversation_history) <= 2 * self.max_turns:
+            return
+        cut = len(self.conversation_history) // 2
+        if self.conversation_history[cut]["role"] != "user":
+            cut += 1  # keep user/assistant pairs together
+        history = list(self.conversation_history)
+        old, recent = history[:cut], history[cut:]
+        transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in old)
+        if self.summary:
+            transcript = f"Earlier summary: {self.summary}\n{transcript}"
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": f"Summarize this conversation briefly:\n{transcript}"}],
+                temperature=0
+            )
+        except Exception:
+            return  # try again next turn rather than lose the turns
+        self.summary = response.choices[0].message.content
+        self._summary_msg = {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+        self.conversation_history = deque(recent, maxlen=self.conversation_history.maxlen)
+
+    async def _write_stream(self, queue: asyncio.Queue):
+        """Print deltas as they are queued, so a slow terminal never holds up the network read"""
+        write, flush = sys.stdout.write, sys.stdout.flush
+        unflushed = 0
+        while (content := await queue.get()) is not None:
+            write(content)
+            unflushed += len(content)
+            # Flush once the backlog is drained, at a sentence end, or every 256 chars,
+            # rather than a write + flush syscall pair per token
+            if queue.empty() or unflushed > 256 or content.endswith(("\n", ".", "!", "?")):
+                flush()
+                unflushed = 0
+        flush()
+
+    async def send_message(self, user_message: str, stream: bool = True) -> str:
+
+        await self._compact_history()
         self.conversation_history.append({
             "role": "user",
             "content": user_message
         })
 
         # Prepare messages with system prompt
-        messages = [
-            {"role": "system", "content": self.system_prompt}
-        ] + self.conversation_history
+        messages = [self._sys_msg]
+        if self.summary:
+            # After the static prefix, so compaction never disturbs the cached system prompt
+            messages.append(self._summary_msg)
+        messages.extend(self.conversation_history)
+
+        cache_key = self._cache_key(messages) if self.temperature == 0 else None
+        query_embedding = None
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is None and self.semantic_cache:
+                cached, query_embedding = await self._semantic_lookup(user_message)
+            if cached is not None:
+                self._cache_hits += 1
+                self.conversation_history.append({
+                    "role": "assistant",
+                    "content": cached
+                })
+                print(f"\nAssistant: {cached}\n")
+                return cached
+            self._cache_misses += 1
 
         try:
             if stream:
                 print("\nAssistant: ", end="", flush=True)
                 
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.7,
-                    stream=True
-                )
-
-                full_response = ""
-                for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        content = chunk.choices[0].delta.content
-                        print(content, end="", flush=True)
-                        full_response += content
+                payload = {
+                    "model": self.model,
+                    "messages": messages,
+                    "temperature": self.temperature,
+                    "stream": True
+                }
+
+                parts: list[str] = []
+                queue: asyncio.Queue = asyncio.Queue()
+                writer = asyncio.create_task(self._write_stream(queue))
+                # Bound once, outside the per-token loop
+                append, put, loads = parts.append, queue.put_nowait, orjson.loads
+                try:
+                    # Read the SSE stream directly: the SDK would build and validate a pydantic
+                    # chunk object per token just for us to read one string out of it
+                    async with _get_http_client().stream(
+                        "POST",
+                        f"{BASE_URL}/chat/completions",
+                        content=orjson.dumps(payload),
+                        headers={"Content-Type": "application/json", "Authorization": f"Bearer {API_KEY}"}
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data: "):
+                                continue
+                            data = line[6:]
+                            if data == "[DONE]":
+                                break
+                            event = loads(data)
+                            if "error" in event or "choices" not in event:
+                                # Servers report mid-stream failures as an event, not an HTTP status
+                                error = event.get("error", event)
+                                raise RuntimeError(error.get("message", error) if isinstance(error, dict) else error)
+                            try:
+                                content = event["choices"][0]["delta"].get("content")
+                            except (IndexError, KeyError, AttributeError):
+                                continue
+                            if not content:
+                                continue
+                            put(content)
+                            append(content)
+                finally:
+                    queue.put_nowait(None)
+                    await writer
+                full_response = "".join(parts)
+                if not full_response:
+                    raise RuntimeError("The model returned an empty reply")
                 
                 print("\n")  # New line after streaming completes
                 
+                if cache_key is not None:
+                    self._store_reply(cache_key, query_embedding, full_response)
+                
                 # Add assistant response to history
                 self.conversation_history.append({
                     "role": "assistant",
@@ -77,14 +348,17 @@ class ChatGPTTerminal:
                 
                 return full_response
             else:
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    temperature=0.7
+                    temperature=self.temperature
                 )
 
                 assistant_message = response.choices[0].message.content
                 
+                if cache_key is not None and assistant_message:
+                    self._store_reply(cache_key, query_embedding, assistant_message)
+                
                 # Add assistant response to history
                 self.conversation_history.append({
                     "role": "assistant",
@@ -101,112 +375,213 @@ class ChatGPTTerminal:
             return error_msg
 
     def handle_command(self, command: str) -> bool:
-        command = command.lower().strip()
+        command = command.strip().lower()
+        handler = self._commands.get(command)
+        if handler is None:
+            return self._cmd_unknown(command)
+        return handler()
+
+    def _cmd_exit(self) -> bool:
+        print("\nGoodbye! Thanks for chatting.\n")
+        return False
+
+    def _cmd_clear(self) -> bool:
+        self.conversation_history.clear()
+        self.summary = ""
+        try:
+            os.remove(SESSION_FILE)
+        except FileNotFoundError:
+            pass
+        self.clear_screen()
+        self.print_header()
+        print("Conversation history cleared.\n")
+        return True
 
-        if command == "/exit":
-            print("\nGoodbye! Thanks for chatting.\n")
-            return False
+    def _cmd_history(self) -> bool:
+        print("\n" + "=" * 70)
+        print("CONVERSATION HISTORY")
+        print("=" * 70)
+        if not self.conversation_history:
+            print("No conversation history yet.\n")
+        else:
+            for i, msg in enumerate(self.conversation_history, 1):
+                role = msg["role"].upper()
+                content = msg["content"]
+                print(f"\n[{i}] {role}:")
+                print(f"{content}")
+                print("-" * 70)
+        print()
+        return True
 
-        elif command == "/clear":
-            self.conversation_history = []
-            self.clear_screen()
-            self.print_header()
-            print("Conversation history cleared.\n")
-
-        elif command == "/history":
-            print("\n" + "=" * 70)
-            print("CONVERSATION HISTORY")
-            print("=" * 70)
-            if not self.conversation_history:
-                print("No conversation history yet.\n")
-            else:
-                for i, msg in enumerate(self.conversation_history, 1):
-                    role = msg["role"].upper()
-                    content = msg["content"]
-                    print(f"\n[{i}] {role}:")
-                    print(f"{content}")
-                    print("-" * 70)
-            print()
-
-        elif command == "/system":
-            print("\nCurrent system prompt:")
-            print(f"  {self.system_prompt}")
-            print("\nEnter new system prompt (or press Enter to keep current):")
-            new_prompt = input("> ").strip()
-            if new_prompt:
-                self.system_prompt = new_prompt
-                print(f"\nSystem prompt updated to: {self.system_prompt}\n")
-            else:
-                print("\nSystem prompt unchanged.\n")
-
-        elif command == "/model":
-            print(f"\nCurrent model: {self.model}")
-            print("\nAvailable models:")
-            print("  1. gpt-4o-mini (fast, cost-effective)")
-            print("  2. gpt-4o (most capable)")
-            print("  3. gpt-3.5-turbo (fast, legacy)")
-            print("\nEnter model number or name (or press Enter to keep current):")
-            choice = input("> ").strip()
-            
-            model_map = {
-                "1": "gpt-4o-mini",
-                "2": "gpt-4o",
-                "3": "gpt-3.5-turbo",
-            }
-            
-            if choice in model_map:
-                self.model = model_map[choice]
-                print(f"\nModel changed to: {self.model}\n")
-            elif choice in ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo", "gpt-4"]:
-                self.model = choice
-                print(f"\nModel changed to: {self.model}\n")
-            elif choice:
-                print(f"\nInvalid choice. Model unchanged.\n")
-            else:
-                print(f"\nModel unchanged.\n")
+    def _cmd_history_json(self) -> bool:
+        print(orjson.dumps(list(self.conversation_history), option=orjson.OPT_INDENT_2).decode())
+        print()
+        return True
 
+    def _cmd_system(self) -> bool:
+        print("\nCurrent system prompt:")
+        print(f"  {self.system_prompt}")
+        print("\nEnter new system prompt to start a new conversation (or press Enter to keep current):")
+        new_prompt = input("> ").strip()
+        if new_prompt:
+            # A new prompt invalidates the cached prefix, so start over rather than mutate mid-chat
+            self.system_prompt = new_prompt
+            self._sys_msg = {"role": "system", "content": self.system_prompt}
+            self.conversation_history.clear()
+            self.summary = ""
+            print(f"\nSystem prompt updated to: {self.system_prompt}")
+            print("Started a new conversation.\n")
         else:
-            print(f"\nUnknown command: {command}")
-            print("Type /exit to see available commands.\n")
+            print("\nSystem prompt unchanged.\n")
+        return True
 
+    def _cmd_model(self) -> bool:
+        print(f"\nCurrent model: {self.model}")
+        print("\nAvailable models:")
+        print("  1. gpt-4o-mini (fast, cost-effective)")
+        print("  2. gpt-4o (most capable)")
+        print("  3. gpt-3.5-turbo (fast, legacy)")
+        print("\nEnter model number or name (or press Enter to keep current):")
+        choice = input("> ").strip()
+        
+        model_map = {
+            "1": "gpt-4o-mini",
+            "2": "gpt-4o",
+            "3": "gpt-3.5-turbo",
+        }
+        
+        if choice in model_map:
+            self.model = model_map[choice]
+            print(f"\nModel changed to: {self.model}\n")
+        elif choice in ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo", "gpt-4"]:
+            self.model = choice
+            print(f"\nModel changed to: {self.model}\n")
+        elif choice:
+            print(f"\nInvalid choice. Model unchanged.\n")
+        else:
+            print(f"\nModel unchanged.\n")
+        return True
+
+    def _cmd_cache(self) -> bool:
+        lookups = self._cache_hits + self._cache_misses
+        hit_rate = self._cache_hits / lookups * 100 if lookups else 0.0
+        print(f"\nResponse cache: {len(self._cache)} entries ({len(self._emb_responses)} embedded)")
+        print(f"  Hits: {self._cache_hits}  Misses: {self._cache_misses}  Hit rate: {hit_rate:.1f}%")
+        if not self.deterministic:
+            print("  (caching is off outside deterministic mode, see /det)")
+        print()
         return True
 
+    def _cmd_det(self) -> bool:
+        self.deterministic = not self.deterministic
+        if self.deterministic:
+            print("\nDeterministic mode on: temperature 0, replies are cached.\n")
+        else:
+            print(f"\nDeterministic mode off: temperature {self.temperature}, no caching.\n")
+        return True
+
+    def _cmd_unknown(self, command: str) -> bool:
+        print(f"\nUnknown command: {command}")
+        print("Type /exit to see available commands.\n")
+        return True
+
+    async def _warmup(self):
+        """Open the pooled connection and get the model loaded before the first real turn"""
+        try:
+            await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": "."}],
+                max_tokens=1
+            )
+        except Exception:
+            pass
+
+    async def run_batch(self, prompts: list[str]) -> list[str]:
+        """Answer independent prompts concurrently, each against the system prompt alone"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def one(prompt: str) -> str:
+            async with semaphore:
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[self._sys_msg, {"role": "user", "content": prompt}],
+                        temperature=self.temperature
+                    )
+                    return response.choices[0].message.content
+                except Exception as e:
+                    return f"Error: {str(e)}"
+
+        return await asyncio.gather(*(one(prompt) for prompt in prompts))
+
     def run(self):
         """Main application loop"""
+        try:
+            asyncio.run(self._amain())
+        except KeyboardInterrupt:
+            # Only reachable where the loop can't own SIGINT (Windows)
+            print("\n\nGoodbye!\n")
+            self._save_session()
+
+    async def _amain(self):
         self.clear_screen()
         self.print_header()
+        warmup = asyncio.create_task(self._warmup())
+        try:
+            # Every Ctrl-C just cancels the current turn; asyncio.run's own handler
+            # would raise KeyboardInterrupt on the second one and skip the final save
+            asyncio.get_running_loop().add_signal_handler(signal.SIGINT, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
 
         print("Welcome! Start chatting with ChatGPT.\n")
         print("Type your message and press Enter. Use /exit to quit.\n")
+        if self._resumed:
+            print(f"Resumed the saved session ({len(self.conversation_history)} messages). "
+                  "Use /clear or start with --new for a fresh one.\n")
 
+        pending_input = None
         while True:
             try:
-                # Get user input
-                user_input = input("You: ").strip()
+                # Get user input; stdin is read on a thread so the loop keeps serving the warmup
+                if pending_input is None:
+                    pending_input = asyncio.ensure_future(asyncio.to_thread(input, "You: "))
+                # Shielded so a Ctrl-C doesn't orphan the thread still waiting on stdin
+                user_input = (await asyncio.shield(pending_input)).strip()
+                pending_input = None
 
                 if not user_input:
                     continue
 
                 # Check if it's a command
                 if user_input.startswith("/"):
-                    should_continue = self.handle_command(user_input)
+                    should_continue = await asyncio.to_thread(self.handle_command, user_input)
                     if not should_continue:
                         break
                     continue
 
                 # Send message to ChatGPT
-                self.send_message(user_input, stream=True)
-
-            except KeyboardInterrupt:
+                await self.send_message(user_input, stream=True)
+                self._turns += 1
+                if self._turns % SAVE_EVERY == 0:
+                    self._save_session()
+
+            except asyncio.CancelledError:
+                # asyncio.run turns Ctrl-C into a cancellation of this task
+                asyncio.current_task().uncancel()
                 print("\n\nInterrupted by user. Type /exit to quit properly.\n")
                 continue
             except EOFError:
                 print("\n\nGoodbye!\n")
                 break
             except Exception as e:
+                pending_input = None
                 print(f"\n\nUnexpected error: {e}\n")
                 continue
 
+        warmup.cancel()
+        self._save_session()
+
 
 def main():
     """Entry point for the application"""
@@ -218,7 +593,20 @@ def main():
         return
 
     # Create and run the chat terminal
-    chat = ChatGPTTerminal()
+    # --new ignores the saved session (it is overwritten on exit)
+    args = [arg for arg in sys.argv[1:] if arg != "--new"]
+    chat = ChatGPTTerminal(resume=len(args) == len(sys.argv) - 1)
+
+    # python test.py --batch prompts.txt answers every line of the file without the prompt loop
+    if len(args) == 2 and args[0] == "--batch":
+        with open(args[1], encoding="utf-8") as f:
+            prompts = [line.strip() for line in f if line.strip()]
+        chat.deterministic = True
+        answers = asyncio.run(chat.run_batch(prompts))
+        for prompt, answer in zip(prompts, answers):
+            print(f"You: {prompt}\nAssistant: {answer}\n")
+        return
+
     chat.run()
 
 